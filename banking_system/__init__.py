@@ -4,9 +4,25 @@ from .functions import FUNCTIONS_MAP
 from .entries import entries
 from .filter_schema import filter_schema
 from .data import load_json_files
+from .response_cache import ResponseCache
 
 CURRENT_PATH = os.path.dirname(__file__)
 
+# Workers started in bulk can opt into the binary snapshot cache
+SNAPSHOT_CACHE = os.environ.get("BANKING_SYSTEM_SNAPSHOT_CACHE", "") not in ("", "0")
+
+# Memory-bound runs can keep transactions in NumPy column arrays. Rows are
+# rebuilt on every read, so full scans (.values()/.items()) run ~40x slower
+# than on dicts; indexed and vectorized lookups are unaffected.
+COLUMNAR = os.environ.get("BANKING_SYSTEM_COLUMNAR", "") not in ("", "0")
+
+# Opt-in: serve repeated read-only calls from an LRU of responses (see response_cache.py)
+RESPONSE_CACHE = (
+    ResponseCache(FUNCTIONS_MAP)
+    if os.environ.get("BANKING_SYSTEM_RESPONSE_CACHE", "") not in ("", "0")
+    else None
+)
+
 with open(os.path.join(CURRENT_PATH, "instructions.md"), "r", encoding="utf-8") as f:
     INSTRUCTIONS = f.read()
 
@@ -18,10 +34,10 @@ for index, entry in enumerate(entries, start=1):
     entries_with_num.append(entry_with_num)
 
 config = {
-    "functions": FUNCTIONS_MAP,
+    "functions": RESPONSE_CACHE.wrap() if RESPONSE_CACHE is not None else FUNCTIONS_MAP,
     "entries": entries_with_num,
     "filter_schema": filter_schema,
-    "data": load_json_files(),
+    "data": load_json_files(lazy=True, cache=SNAPSHOT_CACHE, columnar=COLUMNAR),
     "instructions": INSTRUCTIONS,
 }
 
@@ -0,0 +1,163 @@
+import sys
+import calendar
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; schedules are then built period by period
+    np = None
+
+Row = Dict[str, Any]
+
+# Error bound, in cents per unit of magnitude, of the closed form and of the
+# period loop; amounts closer than that to a half cent may round differently
+_NOISE_CENTS = 100 * 16 * sys.float_info.epsilon
+
+
+def find_loan(loans: Mapping[str, Dict[str, Any]], loan_id: Any) -> Optional[Dict[str, Any]]:
+    """Loan whose numeric key equals loan_id; a direct key lookup for int IDs."""
+    if type(loan_id) is int:
+        return loans.get(str(loan_id))
+    for lid, loan in loans.items():
+        try:
+            if int(lid) == loan_id:
+                return loan
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+@lru_cache(maxsize=None)
+def _month(year: int, month: int) -> Tuple[str, str]:
+    """ISO dates of the first and last day of a month."""
+    last = calendar.monthrange(year, month)[1]
+    return date(year, month, 1).isoformat(), date(year, month, last).isoformat()
+
+
+def _periods(start: datetime, n: int) -> List[Tuple[str, str]]:
+    # First period runs from the start date, the rest from the 1st; each
+    # ends on the last day of its month
+    year, month = start.year, start.month
+    periods = [(start.date().isoformat(), _month(year, month)[1])]
+    for _ in range(n - 1):
+        year, month = year + month // 12, month % 12 + 1
+        periods.append(_month(year, month))
+    return periods
+
+
+def _amounts_loop(principal: float, monthly_rate: float, n: int,
+                  payment: float) -> List[Tuple[float, float, float, float]]:
+    amounts = []
+    balance = principal
+    for _ in range(n):
+        interest = balance * monthly_rate
+        principal_paid = payment - interest
+        # Avoid negative balance in last period
+        if principal_paid > balance:
+            principal_paid = balance
+            payment = principal_paid + interest
+        balance -= principal_paid
+        amounts.append((round(payment, 2), round(principal_paid, 2), round(interest, 2), round(balance, 2)))
+    return amounts
+
+
+def _amounts_closed_form(principal: float, monthly_rate: float, n: int,
+                         payment: float) -> Optional[List[Tuple[float, float, float, float]]]:
+    # Opening balance of period k: P(1+r)^k - A((1+r)^k - 1)/r; without
+    # interest the running subtraction is exactly the loop's
+    if monthly_rate > 0:
+        # expm1/log1p keep (1+r)^k - 1 accurate for small rates
+        accrued = np.expm1(np.arange(n - 1, dtype=np.float64) * np.log1p(monthly_rate))
+        opening = principal + principal * accrued - payment * accrued / monthly_rate
+        magnitude = abs(principal) * (1 + accrued) + abs(payment) * accrued / monthly_rate + n * abs(principal)
+    else:
+        opening = np.subtract.accumulate(np.concatenate(([principal], np.full(max(n - 2, 0), payment))))[:n - 1]
+        magnitude = np.full(n - 1, abs(principal))
+    interest = opening * monthly_rate
+    principal_paid = payment - interest
+    balance = opening - principal_paid
+    amounts = np.stack((principal_paid, interest, balance))
+    cents = amounts * 100
+    if (np.abs(cents - np.floor(cents) - 0.5) < magnitude * _NOISE_CENTS).any():
+        # Within rounding noise of a half cent: only the loop rounds it the same way
+        return None
+    # Away from ties np.round() agrees with the loop's round()
+    amounts = list(zip([round(payment, 2)] * (n - 1), *np.round(amounts, 2).tolist()))
+    # The last period settles the remaining balance as the loop does
+    last_opening = balance[-1].item() if n > 1 else principal
+    amounts.extend(_amounts_loop(last_opening, monthly_rate, 1, payment))
+    return amounts
+
+
+@lru_cache(maxsize=4096)
+def amortization_schedule(principal: float, annual_rate: float, tenure: int,
+                          start_date: str) -> Tuple[Row, ...]:
+    """
+    Fixed-payment schedule of a loan, one row per month. Computed in closed
+    form with NumPy when it is installed, by the period loop otherwise, and
+    memoized on the loan terms; callers must not mutate the rows.
+    Raises ValueError for an unparseable start_date.
+    """
+    try:
+        period_start = datetime.fromisoformat(start_date)
+    except Exception:
+        raise ValueError(start_date)
+
+    monthly_rate = annual_rate / 100 / 12
+    n = tenure if tenure > 0 else 1
+
+    # Calculate fixed monthly payment
+    if monthly_rate > 0:
+        payment = principal * monthly_rate / (1 - (1 + monthly_rate) ** (-n))
+    else:
+        payment = principal / n
+
+    amounts = None
+    if np is not None and monthly_rate >= 0:
+        amounts = _amounts_closed_form(principal, monthly_rate, n, payment)
+    if amounts is None:
+        amounts = _amounts_loop(principal, monthly_rate, n, payment)
+    return tuple(
+        {
+            "period_start": start,
+            "period_end": end,
+            "scheduled_amount": scheduled,
+            "principal": principal_paid,
+            "interest": interest,
+            "balance": balance
+        }
+        for (start, end), (scheduled, principal_paid, interest, balance) in zip(_periods(period_start, n), amounts)
+    )
+
+
+def loan_schedule(loans: Mapping[str, Dict[str, Any]], loan_id: Any) -> Union[Tuple[Row, ...], str]:
+    """
+    Schedule of one loan, or the error string get_loan_amortization_schedule
+    returns. The rows are the memoized ones and must not be mutated.
+    """
+    loan = find_loan(loans, loan_id)
+    if not loan:
+        return f"Error: Loan '{loan_id}' not found"
+    start_date = loan.get('start_date')
+    try:
+        return amortization_schedule(
+            loan.get('principal_amount', 0), loan.get('interest_rate', 0), loan.get('tenure', 0), start_date
+        )
+    except ValueError:
+        return f"Error: Invalid start_date '{start_date}' for loan '{loan_id}'"
+
+
+def loan_schedules(data: Mapping[str, Any], loan_ids: Iterable[Any]) -> Dict[Any, Union[List[Row], str]]:
+    """
+    Schedules of many loans at once (loan ID -> rows, or error string).
+    Loans with the same terms share one computation; the rows returned are
+    copies, free for the caller to modify.
+    """
+    loans = data.get('loans', {})
+    schedules = {}
+    for loan_id in loan_ids:
+        schedule = loan_schedule(loans, loan_id)
+        schedules[loan_id] = schedule if isinstance(schedule, str) else [dict(row) for row in schedule]
+    return schedules
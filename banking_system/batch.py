@@ -0,0 +1,185 @@
+import time
+import inspect
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .functions import FUNCTIONS_MAP
+
+# (name, apply, arguments) of one validated action
+Prepared = Tuple[str, Callable[..., str], Dict[str, Any]]
+
+_MISSING = object()
+
+
+class BatchError(ValueError):
+    """Raised by prepare_actions() with every invalid action of a batch; nothing has run."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("Invalid actions:\n" + "\n".join(errors))
+        self.errors = errors
+
+
+class Step:
+    """Output and wall time of one executed action."""
+
+    __slots__ = ("name", "arguments", "output", "seconds")
+
+    def __init__(self, name: str, arguments: Dict[str, Any], output: str, seconds: float):
+        self.name = name
+        self.arguments = arguments
+        self.output = output
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return f"Step({self.name!r}, {self.seconds * 1000:.3f} ms)"
+
+
+class BatchResult:
+    """Steps of a run_actions() call in execution order, plus the total wall time."""
+
+    def __init__(self, steps: List[Step], seconds: float):
+        self.steps = steps
+        self.seconds = seconds
+
+    @property
+    def outputs(self) -> List[str]:
+        return [step.output for step in self.steps]
+
+    def timings(self) -> List[Tuple[str, float]]:
+        return [(step.name, step.seconds) for step in self.steps]
+
+
+def _coerce(value: Any, schema: Mapping[str, Any]) -> Any:
+    """
+    value converted to the JSON schema type of a parameter; recorded tasks
+    pass numbers as strings ("480"). Returns _MISSING when it cannot be.
+    """
+    kind = schema.get("type")
+    if value is None or isinstance(value, bool):
+        return value
+    if kind == "integer":
+        if isinstance(value, int):
+            return value
+        if isinstance(value, float):
+            return int(value) if value.is_integer() else _MISSING
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                return _MISSING
+        return _MISSING
+    if kind == "number":
+        if isinstance(value, (int, float)):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                pass
+            try:
+                return float(value)
+            except ValueError:
+                return _MISSING
+        return _MISSING
+    if kind == "string":
+        if isinstance(value, (int, float)):
+            return str(value)
+        return value if isinstance(value, str) else _MISSING
+    if kind == "array":
+        # list_* functions also take comma-separated strings
+        return value if isinstance(value, (list, tuple, str)) else _MISSING
+    return value
+
+
+class _Spec:
+    """Callable and parameter schema of one function, resolved once per batch."""
+
+    def __init__(self, function: Any):
+        self.apply = function.apply
+        parameters = function.get_metadata()["function"]["parameters"]
+        self.properties: Dict[str, Any] = parameters.get("properties", {})
+        # CachedFunction (response_cache.py) stands in for the class it wraps
+        signature = inspect.signature(getattr(function, "function", function).apply)
+        params = [p for name, p in signature.parameters.items() if name != "data"]
+        self.accepted = {p.name for p in params}
+        self.required = set(parameters.get("required", ())) | {
+            p.name for p in params if p.default is inspect.Parameter.empty
+        }
+
+    def validate(self, arguments: Mapping[str, Any], coerce: bool) -> Tuple[Dict[str, Any], List[str]]:
+        errors = []
+        missing = sorted(self.required - set(arguments))
+        if missing:
+            errors.append(f"missing required argument(s): {', '.join(missing)}")
+        unexpected = sorted(set(arguments) - self.accepted)
+        if unexpected:
+            errors.append(f"unexpected argument(s): {', '.join(unexpected)}")
+        prepared = dict(arguments)
+        if coerce:
+            for name, value in arguments.items():
+                schema = self.properties.get(name)
+                if schema is None:
+                    continue
+                converted = _coerce(value, schema)
+                if converted is _MISSING:
+                    errors.append(f"'{name}' must be of type {schema.get('type')}, got {value!r}")
+                else:
+                    prepared[name] = converted
+        return prepared, errors
+
+
+def prepare_actions(actions: Sequence[Mapping[str, Any]], functions: Optional[Mapping[str, Any]] = None,
+                    coerce: bool = False) -> List[Prepared]:
+    """
+    Resolve and validate every {name, arguments} action before any runs.
+    Arguments are passed as given, like FUNCTIONS_MAP[name].apply(data,
+    **arguments); with coerce, they are first converted to the types in
+    each function's metadata (which changes what some calls return).
+    Raises BatchError listing every invalid action.
+    """
+    functions = FUNCTIONS_MAP if functions is None else functions
+    specs: Dict[str, _Spec] = {}
+    prepared: List[Prepared] = []
+    errors: List[str] = []
+    for number, action in enumerate(actions, start=1):
+        name = action.get("name")
+        arguments = action.get("arguments") or {}
+        spec = specs.get(name)
+        if spec is None:
+            function = functions.get(name)
+            if function is None:
+                errors.append(f"step {number}: unknown function '{name}'")
+                continue
+            spec = specs[name] = _Spec(function)
+        if not isinstance(arguments, Mapping):
+            errors.append(f"step {number} ({name}): 'arguments' must be an object")
+            continue
+        arguments, problems = spec.validate(arguments, coerce)
+        errors.extend(f"step {number} ({name}): {problem}" for problem in problems)
+        prepared.append((name, spec.apply, arguments))
+    if errors:
+        raise BatchError(errors)
+    return prepared
+
+
+def run_prepared(data: Mapping[str, Any], prepared: Sequence[Prepared]) -> BatchResult:
+    """Execute prepared actions in order on data, timing each one."""
+    clock = time.perf_counter
+    steps: List[Step] = []
+    started = clock()
+    for name, apply, arguments in prepared:
+        start = clock()
+        output = apply(data, **arguments)
+        steps.append(Step(name, arguments, output, clock() - start))
+    return BatchResult(steps, clock() - started)
+
+
+def run_actions(data: Mapping[str, Any], actions: Sequence[Mapping[str, Any]],
+                functions: Optional[Mapping[str, Any]] = None, coerce: bool = False) -> BatchResult:
+    """
+    Run a list of {name, arguments} actions (entries.py, tasks/*.json) in
+    order on one data view and return every output with its timing. All
+    actions are validated first (see prepare_actions()); without coerce
+    the outputs are those of dispatching each action in turn. Writes land
+    in data, so pass an EpisodeData to keep the baseline untouched.
+    """
+    return run_prepared(data, prepare_actions(actions, functions, coerce))
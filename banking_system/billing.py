@@ -0,0 +1,274 @@
+import time
+from itertools import count
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from .data import candidate_keys, insert_row, latest_keys, next_id, penalty_bands, update_row
+
+# 30-day billing cycle, due 10 days after the period ends
+BILLING_DAYS = 30
+PAYMENT_DUE_DAYS = 10
+
+# Loan statements: 30-day period, due 10 days after it ends
+LOAN_PERIOD_DAYS = 30
+LOAN_DUE_DAYS = 10
+
+Statement = Dict[str, Any]
+# (ID as passed, new statement or error string) of one billed card or loan
+Result = Tuple[Any, Union[Statement, str]]
+
+
+def _occurred_date(occurred_at: Any) -> Optional[date]:
+    try:
+        return datetime.fromisoformat(occurred_at).date() if isinstance(occurred_at, str) else occurred_at.date()
+    except Exception:
+        return None
+
+
+def _previous_period_ends(data: Mapping[str, Any], table: str, field: str, ids: set) -> Dict[Any, date]:
+    """
+    Latest period_end of the statements of each card or loan (field): from
+    the statements' (field, period_end) index when data carries indexes,
+    in one pass over the table otherwise.
+    """
+    statements = data.get(table, {})
+    latest = latest_keys(data, table, field, ids, 'period_end')
+    if latest is not None:
+        return {owner: datetime.fromisoformat(statements[key]['period_end']).date()
+                for owner, key in latest.items()}
+    ends: Dict[Any, date] = {}
+    for statement in statements.values():
+        owner = statement.get(field)
+        if owner in ids:
+            end = datetime.fromisoformat(statement['period_end']).date()
+            if owner not in ends or end > ends[owner]:
+                ends[owner] = end
+    return ends
+
+
+def _grouped_transactions(data: Mapping[str, Any], field: str,
+                          ids: set) -> Dict[Any, List[Tuple[str, Dict[str, Any]]]]:
+    """(key, transaction) pairs of each card or loan (field), in table order."""
+    transactions = data.get('transactions', {})
+    if len(ids) == 1:
+        # One owner: its posting list, when data carries indexes
+        owner = next(iter(ids))
+        keys = candidate_keys(data, 'transactions', {field: owner})
+        if keys is not None:
+            return {owner: [(key, transactions[key]) for key in keys]}
+    grouped: Dict[Any, List[Tuple[str, Dict[str, Any]]]] = {owner: [] for owner in ids}
+    for key, txn in transactions.items():
+        rows = grouped.get(txn.get(field))
+        if rows is not None:
+            rows.append((key, txn))
+    return grouped
+
+
+def generate_card_statements(data: Mapping[str, Any], card_ids: Optional[Iterable[int]] = None,
+                             now: Optional[datetime] = None) -> List[Result]:
+    """
+    Bill many cards at once (every card when card_ids is None). Returns
+    one (card_id, result) pair per ID passed, in order: the new statement,
+    or the error string generate_card_statement would return. Statements,
+    transaction totals and BILLED marks are the same as calling
+    generate_card_statement per card in order (a card listed twice is
+    billed for two consecutive periods), but the statements and
+    transactions are each read in one pass instead of once per card.
+    """
+    cards = data.get('cards', {})
+    card_ids = [int(key) for key in cards if key.isdigit()] if card_ids is None else list(card_ids)
+    results: List[Union[Statement, str, None]] = [None] * len(card_ids)
+    billable: List[Tuple[int, int, Dict[str, Any]]] = []
+    for position, card_id in enumerate(card_ids):
+        if not isinstance(card_id, int):
+            results[position] = "Error: 'card_id' must be an integer"
+            continue
+        card = cards.get(str(int(card_id)))
+        if card is None:
+            results[position] = f"Error: Card '{card_id}' not found"
+            continue
+        billable.append((position, card_id, card))
+    if not billable:
+        return list(zip(card_ids, results))
+
+    targets = {card_id for _, card_id, _ in billable}
+    previous_ends = _previous_period_ends(data, 'card_statements', 'card_id', targets)
+    card_txns = _grouped_transactions(data, 'card_id', targets)
+    created_at = (now or datetime.now()).isoformat()
+    # IDs follow on from each other; only the first needs a lookup
+    statement_ids = count(next_id(data, 'card_statements'))
+
+    for position, card_id, card in billable:
+        prev_end = previous_ends.get(card_id)
+        if prev_end is None:
+            # first period starts at issue date
+            try:
+                prev_end = datetime.fromisoformat(card['issued_date']).date() - timedelta(days=1)
+            except Exception:
+                results[position] = "Error: card.issued_date is invalid"
+                continue
+
+        period_start = prev_end + timedelta(days=1)
+        period_end = period_start + timedelta(days=BILLING_DAYS - 1)
+        payment_due_date = period_end + timedelta(days=PAYMENT_DUE_DAYS)
+
+        # Sum the period's transactions and mark them billed
+        total_due = 0.0
+        for key, txn in card_txns.get(card_id, ()):
+            occurred = _occurred_date(txn.get('occurred_at'))
+            if occurred is not None and period_start <= occurred <= period_end:
+                total_due += txn.get('amount', 0)
+                update_row(data, 'transactions', key, {'card_tx_status': 'BILLED'})
+
+        total_due = round(total_due, 2)
+        minimum_due = round(total_due * 0.10, 2)  # e.g., 10% minimum payment
+
+        new_sid = str(next(statement_ids))
+        stmt = {
+            "statement_id": int(new_sid),
+            "card_id": card_id,
+            "period_start": period_start.isoformat(),
+            "period_end": period_end.isoformat(),
+            "total_due": total_due,
+            "minimum_due": minimum_due,
+            "payment_due_date": payment_due_date.isoformat(),
+            "late_fee_amount": 0.00,
+            "penalty_rate_id": None,
+            "status": "OPEN",
+            "created_at": created_at
+        }
+        insert_row(data, 'card_statements', new_sid, stmt)
+        # A card listed twice is billed for the period after this one
+        previous_ends[card_id] = period_end
+        results[position] = stmt
+    return list(zip(card_ids, results))
+
+
+def _find_loan(loans: Mapping[str, Dict[str, Any]], loan_id: int) -> Optional[Dict[str, Any]]:
+    """First loan whose loan_id field matches, by key when the key agrees."""
+    loan = loans.get(str(loan_id))
+    if loan is not None and str(loan.get('loan_id')) == str(loan_id):
+        return loan
+    return next((ln for ln in loans.values() if str(ln.get('loan_id')) == str(loan_id)), None)
+
+
+def _scheduled_amount(loan: Dict[str, Any]) -> float:
+    P = loan.get('principal_amount', 0)
+    annual_rate = loan.get('interest_rate', 0)
+    n = loan.get('tenure', 1)
+    r = annual_rate / 100 / 12
+    if r > 0:
+        sched = P * r * (1 + r)**n / ((1 + r)**n - 1)
+    else:
+        sched = P / n
+    return round(sched, 2)
+
+
+def generate_loan_statements(data: Mapping[str, Any], loan_ids: Optional[Iterable[int]] = None,
+                             now: Optional[datetime] = None,
+                             timings: Optional[Dict[str, float]] = None) -> List[Result]:
+    """
+    Issue the next statement of many loans at once (every ACTIVE loan when
+    loan_ids is None), applying late fees to unpaid overdue periods.
+    Returns one (loan_id, result) pair per ID passed, in order: the new
+    statement, or the error string generate_loan_statement would return.
+    Statements are the same as calling generate_loan_statement per loan in
+    order (a loan listed twice gets two consecutive periods).
+
+    Previous period ends, loan payments and penalty bands are each
+    gathered once, from indexes when data carries them; a late fee's band
+    is then a bisect away. timings, if given, receives the seconds spent
+    per phase (statements, payments, penalty_rates, emit).
+    """
+    clock = time.perf_counter
+    loans = data.get('loans', {})
+    if loan_ids is None:
+        loan_ids = [loan.get('loan_id') for loan in loans.values() if loan.get('status') == 'ACTIVE']
+    else:
+        loan_ids = list(loan_ids)
+    results: List[Union[Statement, str, None]] = [None] * len(loan_ids)
+    billable: List[Tuple[int, int, Dict[str, Any]]] = []
+    for position, loan_id in enumerate(loan_ids):
+        if not isinstance(loan_id, int):
+            results[position] = "Error: 'loan_id' must be an integer"
+            continue
+        loan = _find_loan(loans, loan_id)
+        if loan is None:
+            results[position] = f"Error: Loan '{loan_id}' not found"
+            continue
+        billable.append((position, loan_id, loan))
+    if not billable:
+        return list(zip(loan_ids, results))
+
+    phases: Dict[str, float] = {}
+    targets = {loan_id for _, loan_id, _ in billable}
+    start = clock()
+    previous_ends = _previous_period_ends(data, 'loan_statements', 'loan_id', targets)
+    phases['statements'] = clock() - start
+
+    start = clock()
+    payments = _grouped_transactions(data, 'loan_id', targets)
+    phases['payments'] = clock() - start
+
+    start = clock()
+    penalty_rates = data.get('penalty_rates', {})
+    bands = penalty_bands(data, 'LOAN')
+    phases['penalty_rates'] = clock() - start
+
+    start = clock()
+    now = now or datetime.now()
+    created_at, today = now.isoformat(), now.date()
+    statement_ids = count(next_id(data, 'loan_statements'))
+    for position, loan_id, loan in billable:
+        prev_end = previous_ends.get(loan_id)
+        if prev_end is None:
+            # first period starts at loan start_date
+            try:
+                prev_end = datetime.fromisoformat(loan.get('start_date')).date() - timedelta(days=1)
+            except Exception:
+                results[position] = "Error: loan.start_date invalid"
+                continue
+
+        period_start = prev_end + timedelta(days=1)
+        period_end = period_start + timedelta(days=LOAN_PERIOD_DAYS - 1)
+        due_date = period_end + timedelta(days=LOAN_DUE_DAYS)
+        sched = _scheduled_amount(loan)
+
+        new_sid = str(next(statement_ids))
+        stmt = {
+            "statement_id": int(new_sid),
+            "loan_id": loan_id,
+            "period_start": period_start.isoformat(),
+            "period_end": period_end.isoformat(),
+            "due_date": due_date.isoformat(),
+            "scheduled_amount": sched,
+            "late_fee_amount": 0.00,
+            "penalty_rate_id": None,
+            "status": "PENDING",
+            "created_at": created_at
+        }
+
+        if due_date < today:
+            # Check for transactions in period before due_date
+            paid = any(
+                period_start <= datetime.fromisoformat(txn.get('occurred_at')).date() <= due_date
+                for _, txn in payments.get(loan_id, ())
+            )
+            if not paid:
+                days_overdue = (today - due_date).days
+                loan_bands = bands.get(loan.get('type'))
+                pr_key = loan_bands.first(days_overdue) if loan_bands is not None else None
+                pr = penalty_rates[pr_key] if pr_key is not None else None
+                if pr:
+                    stmt['late_fee_amount'] = round(sched * pr['rate'] / 100, 2)
+                    stmt['penalty_rate_id'] = pr['penalty_rate_id']
+
+        insert_row(data, 'loan_statements', new_sid, stmt)
+        # A loan listed twice gets the statement for the period after this one
+        previous_ends[loan_id] = period_end
+        results[position] = stmt
+    phases['emit'] = clock() - start
+
+    if timings is not None:
+        timings.update(phases)
+    return list(zip(loan_ids, results))
@@ -1,16 +1,227 @@
 import os
 import json
+import time
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .snapshot import default_cache_dir, load_table_cached
+from .episode import EpisodeData, OverlayTable, insert_row, update_row, writable_row
+from .indexes import _MISSING, IndexRegistry, candidate_keys, find_row, latest_keys, recent_keys
+from .sequences import max_id, next_id
+from .columnar import ColumnarRows, columnar_store, to_columnar
+from .filters import CONTAINS, EQ, NUMERIC, RANGE, TIME_RANGE, filter_rows
+from .versions import TableVersions, table_versions
+from .payments import payments_since
+from .penalties import penalty_bands, penalty_rate_keys
+from .fragments import RowFragments
+from .temporal import DAY_MICROS, parse_column, temporal_column, to_micros
+
+__all__ = [
+    "COLUMNAR_TABLES", "DATA_DIR", "LazyTables", "load_json_files",
+    # Episode views and the write API
+    "EpisodeData", "OverlayTable", "insert_row", "next_id", "update_row",
+    # Index lookups
+    "candidate_keys", "find_row", "latest_keys", "payments_since", "penalty_bands", "penalty_rate_keys",
+    "recent_keys",
+    # Columnar store and its filters
+    "CONTAINS", "EQ", "NUMERIC", "RANGE", "TIME_RANGE", "ColumnarRows", "columnar_store", "filter_rows",
+    # Per-table caches
+    "DAY_MICROS", "RowFragments", "table_versions", "temporal_column", "to_micros",
+]
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Tables stored column-wise (NumPy) when columnar loading is enabled. The
+# trade-off is per-read cost: ColumnarRows rebuilds row dicts on every
+# access and caches none, so a full .values()/.items() scan of transactions
+# (~10.7k rows) takes ~17 ms against ~0.4 ms for the dict table.
+COLUMNAR_TABLES = ("transactions",)
+
+
+def _table_files(directory: str) -> Dict[str, str]:
+    return {
+        os.path.splitext(filename)[0]: os.path.join(directory, filename)
+        for filename in os.listdir(directory)
+        if filename.endswith(".json")
+    }
+
+
+def _load_table(file_path: str, cache_dir: Optional[str] = None) -> Tuple[Any, Optional[int]]:
+    """Parse one table; also returns its ID sequence seed when the snapshot has it."""
+    if cache_dir is not None:
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        return load_table_cached(file_path, name, cache_dir)
+    with open(file_path, "r", encoding="utf-8") as file:
+        return json.load(file), None
+
+
+class LazyTables(MutableMapping):
+    """
+    Mapping of table name -> parsed table that reads each JSON file the
+    first time the table is accessed. Behaves like the dict returned by
+    load_json_files(); tables that fail to parse are reported and dropped,
+    so data.get(name, {}) falls back to the default exactly as before.
+
+    load_times records the parse time in seconds of every loaded table.
+    With a cache_dir, tables are read through the binary snapshot cache.
+    sequences holds the largest numeric row key per loaded table, seeded
+    once at load and advanced by insert_row(), so next_id() is O(1).
+    Date columns are parsed once on first use (temporal_column()) and kept
+    in sync by insert_row() and update_row(). Tables named in columnar are
+    held in a ColumnarRows store when NumPy is installed (see columnar.py).
+    versions stamps each table on every insert_row()/update_row() and
+    whenever a table is replaced. fragments caches encoded rows for
+    responses and drops each row as update_row() changes it. indexes
+    holds secondary indexes, built on first use and kept in sync by
+    insert_row()/update_row(); a replaced or deleted table drops its own.
+    """
+
+    def __init__(self, directory: Optional[str] = None, cache_dir: Optional[str] = None,
+                 columnar: Tuple[str, ...] = ()):
+        self.directory = directory or DATA_DIR
+        self.cache_dir = cache_dir
+        self.columnar = columnar
+        self._files = _table_files(self.directory)
+        self._tables: Dict[str, Any] = {}
+        self.load_times: Dict[str, float] = {}
+        self.sequences: Dict[str, int] = {}
+        self._temporal: Dict[str, Dict[str, Dict[str, Optional[int]]]] = {}
+        self.versions = TableVersions()
+        self.fragments = RowFragments()
+        self.indexes = IndexRegistry(self)
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._tables:
+            return self._tables[name]
+        file_path = self._files.get(name)
+        if file_path is None:
+            raise KeyError(name)
+        start = time.perf_counter()
+        try:
+            table, last_id = _load_table(file_path, self.cache_dir)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading {os.path.basename(file_path)}: {e}")
+            del self._files[name]
+            raise KeyError(name) from e
+        if last_id is None and isinstance(table, dict):
+            last_id = max_id(table)
+        if last_id is not None:
+            self.sequences[name] = last_id
+        if name in self.columnar:
+            table = to_columnar(table)
+        self.load_times[name] = time.perf_counter() - start
+        self._tables[name] = table
+        return table
+
+    def __setitem__(self, name: str, table: Any) -> None:
+        self._tables[name] = table
+        self._files.setdefault(name, None)
+        self.sequences.pop(name, None)
+        self._temporal.pop(name, None)
+        self.indexes.drop(name)
+        self.versions.bump(name)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self._files:
+            raise KeyError(name)
+        del self._files[name]
+        self._tables.pop(name, None)
+        self.load_times.pop(name, None)
+        self.sequences.pop(name, None)
+        self._temporal.pop(name, None)
+        self.indexes.drop(name)
+        self.versions.bump(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._files
+
+    def last_id(self, name: str) -> int:
+        table = self[name]
+        last = self.sequences.get(name)
+        if last is None:
+            last = max_id(table)
+        # Catch up with rows written without insert_row()
+        while str(last + 1) in table:
+            last += 1
+        self.sequences[name] = last
+        return last
+
+    def next_id(self, name: str) -> int:
+        return self.last_id(name) + 1
+
+    def insert_row(self, name: str, key: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        table = self[name]
+        shadowed = table.get(key)
+        if shadowed is not None:
+            self.indexes.removed(name, key, shadowed)
+        table[key] = row
+        self.indexes.added(name, key, row)
+        self.versions.bump(name)
+        if key.isdigit() and int(key) > self.sequences.get(name, 0):
+            self.sequences[name] = int(key)
+        for field, column in self._temporal.get(name, {}).items():
+            column[key] = to_micros(row.get(field))
+        return row
+
+    def update_row(self, name: str, key: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        row = writable_row(self[name], key)
+        before = {field: row.get(field, _MISSING) for field in changes}
+        self.fragments.discard(row)
+        row.update(changes)
+        self.indexes.updated(name, key, before, row)
+        self.versions.bump(name)
+        for field, column in self._temporal.get(name, {}).items():
+            if field in changes:
+                column[key] = to_micros(row.get(field))
+        return row
+
+    def temporal_column(self, name: str, field: str) -> Dict[str, Optional[int]]:
+        columns = self._temporal.setdefault(name, {})
+        column = columns.get(field)
+        if column is None:
+            column = columns[field] = parse_column(self[name], field)
+        return column
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._tables
+
+    def load_all(self) -> "LazyTables":
+        for name in list(self._files):
+            self.get(name)
+        return self
+
+    def __repr__(self) -> str:
+        loaded = sorted(self._tables)
+        return f"LazyTables(tables={sorted(self._files)}, loaded={loaded})"
+
+
+def load_json_files(lazy: bool = False, cache: bool = False, columnar: bool = False):
+    """
+    Load every table in the data directory. With lazy=True a LazyTables
+    mapping is returned instead, which defers parsing each file until the
+    table is first read. With cache=True tables are loaded from pickle
+    snapshots (see snapshot.py) and JSON is only parsed when a snapshot
+    is missing or stale. With columnar=True the COLUMNAR_TABLES are kept
+    in NumPy column arrays behind a dict-like facade (needs NumPy; ignored
+    without it).
+    """
+    cache_dir = default_cache_dir(DATA_DIR) if cache else None
+    columnar_tables = COLUMNAR_TABLES if columnar else ()
+    if lazy:
+        return LazyTables(DATA_DIR, cache_dir, columnar_tables)
 
-def load_json_files():
-    directory = os.path.dirname(os.path.abspath(__file__))
-    
     data = {}
-    for filename in os.listdir(directory):
-        if filename.endswith(".json"):
-            file_path = os.path.join(directory, filename)
-            try:
-                with open(file_path, "r", encoding="utf-8") as file:
-                    data[os.path.splitext(filename)[0]] = json.load(file)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading {filename}: {e}")
+    for name, file_path in _table_files(DATA_DIR).items():
+        try:
+            data[name] = _load_table(file_path, cache_dir)[0]
+            if name in columnar_tables:
+                data[name] = to_columnar(data[name])
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error loading {os.path.basename(file_path)}: {e}")
     return data
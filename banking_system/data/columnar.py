@@ -0,0 +1,226 @@
+from collections.abc import ItemsView, Mapping, ValuesView
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; without it tables stay plain dicts
+    np = None
+
+from .episode import OverlayTable
+from .temporal import to_micros
+
+# Column kinds
+INT = "int"
+FLOAT = "float"
+ENCODED = "encoded"
+
+# Rows materialized per block when iterating a whole table
+_BLOCK = 1024
+
+
+def _picker(positions: Tuple[int, ...]) -> Callable[[tuple], tuple]:
+    """itemgetter(*positions) that returns a tuple for any number of positions."""
+    if len(positions) > 1:
+        return itemgetter(*positions)
+    if positions:
+        position = positions[0]
+        return lambda values: (values[position],)
+    return lambda values: ()
+
+
+class Column:
+    """
+    One column of a ColumnarRows table.
+
+    INT and FLOAT columns hold their values in a NumPy array with a
+    boolean mask of None/missing cells. Every other column is
+    dictionary-encoded: codes index into vocab, which holds each distinct
+    value once. Columns of ISO date strings also carry micros, the
+    to_micros value of every cell (nulls masked), for range filters.
+    """
+
+    def __init__(self, kind: str, values: Any, nulls: Any = None, vocab: Optional[List[Any]] = None,
+                 micros: Any = None):
+        self.kind = kind
+        self.values = values
+        self.nulls = nulls
+        self.vocab = vocab
+        self.micros = micros
+        self._folded: Optional[List[str]] = None
+
+    @classmethod
+    def encode(cls, values: List[Any]) -> "Column":
+        present = [value for value in values if value is not None]
+        nulls = np.fromiter((value is None for value in values), dtype=bool, count=len(values))
+        if present and all(type(value) is int and -2**63 <= value < 2**63 for value in present):
+            return cls(INT, np.array([0 if v is None else v for v in values], dtype=np.int64), nulls)
+        if present and all(type(value) is float for value in present):
+            return cls(FLOAT, np.array([0.0 if v is None else v for v in values], dtype=np.float64), nulls)
+
+        # Keyed by type too, so 1, 1.0 and True stay distinct values
+        positions: Dict[Tuple[type, Any], int] = {}
+        vocab: List[Any] = []
+        codes = []
+        for value in values:
+            try:
+                code = positions.get((type(value), value))
+            except TypeError:
+                code = None  # unhashable values are stored once per cell
+            if code is None:
+                code = len(vocab)
+                vocab.append(value)
+                try:
+                    positions[(type(value), value)] = code
+                except TypeError:
+                    pass
+            codes.append(code)
+        column = cls(ENCODED, np.array(codes, dtype=np.int32), nulls, vocab)
+        if present and all(type(value) is str and to_micros(value) is not None for value in vocab if value is not None):
+            micros = [to_micros(value) if value is not None else 0 for value in vocab]
+            column.micros = np.array(micros, dtype=np.int64)[column.values]
+        return column
+
+    def value(self, position: int) -> Any:
+        if self.kind == ENCODED:
+            return self.vocab[self.values.item(position)]
+        if self.nulls.item(position):
+            return None
+        return self.values.item(position)
+
+    def take(self, index: Any) -> List[Any]:
+        """Python values at index, a slice or a list of positions."""
+        codes = self.values[index].tolist()
+        if self.kind == ENCODED:
+            vocab = self.vocab
+            return [vocab[code] for code in codes]
+        nulls = self.nulls[index].tolist()
+        return [None if null else v for v, null in zip(codes, nulls)]
+
+    def folded(self) -> List[str]:
+        """(value or '').lower() of every vocab entry (all str or None), computed once."""
+        if self._folded is None:
+            self._folded = [(value or '').lower() for value in self.vocab]
+        return self._folded
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.values, self.nulls, self.micros)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+
+class ColumnarRows(Mapping):
+    """
+    Read-only, NumPy-backed copy of a table (row key -> row dict) that
+    stores one array per column instead of one dict per row. Lookups and
+    iteration build the row dicts on the fly, with the same keys, key
+    order and Python values as the source rows, so functions read it like
+    the original table.
+
+    Rows are rebuilt on every access and never cached, which keeps the
+    memory saving but makes a full values()/items() scan ~40x slower than
+    on a dict; wrap the store in an OverlayTable (as LazyTables does) to
+    write to it. columns exposes the arrays for
+    vectorized filters; positions maps a row key to its array index.
+    """
+
+    def __init__(self, table: Mapping[str, Dict[str, Any]]):
+        if np is None:
+            raise ImportError("ColumnarRows requires NumPy")
+        self.row_keys = list(table)
+        self.positions = {key: position for position, key in enumerate(self.row_keys)}
+        rows = [table[key] for key in self.row_keys]
+
+        # Each row's field order ("layout"); rows missing a field use a layout without it
+        layouts: Dict[Tuple[str, ...], int] = {}
+        fields: Dict[str, None] = {}
+        codes = []
+        for row in rows:
+            layout = tuple(row)
+            code = layouts.get(layout)
+            if code is None:
+                code = layouts[layout] = len(layouts)
+                fields.update(dict.fromkeys(layout))
+            codes.append(code)
+        self.layouts: List[Tuple[str, ...]] = list(layouts)
+        self.layout_codes = np.array(codes, dtype=np.int32)
+        self.columns: Dict[str, Column] = {
+            field: Column.encode([row.get(field) for row in rows]) for field in fields
+        }
+        # Per layout, picks its fields (in its order) out of a tuple of all column values
+        order = {field: position for position, field in enumerate(self.columns)}
+        self._pickers = [_picker(tuple(order[field] for field in layout)) for layout in self.layouts]
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        position = self.positions[key]
+        columns = self.columns
+        layout = self.layouts[self.layout_codes.item(position)]
+        return {field: columns[field].value(position) for field in layout}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.row_keys)
+
+    def __len__(self) -> int:
+        return len(self.row_keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.positions
+
+    def values(self) -> ValuesView:
+        return _ColumnarValues(self)
+
+    def items(self) -> ItemsView:
+        return _ColumnarItems(self)
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Row dicts of positions start..stop-1, materialized a block at a time."""
+        stop = len(self.row_keys) if stop is None else stop
+        for block in range(start, stop, _BLOCK):
+            end = min(block + _BLOCK, stop)
+            yield from self._build(slice(block, end))
+
+    def rows_at(self, positions: Any) -> List[Dict[str, Any]]:
+        """Row dicts at the given array positions (list or integer array), in that order."""
+        if len(positions) == 0:
+            return []
+        return self._build(np.asarray(positions, dtype=np.intp))
+
+    def _build(self, index: Any) -> List[Dict[str, Any]]:
+        layouts, pickers = self.layouts, self._pickers
+        columns = [column.take(index) for column in self.columns.values()]
+        return [
+            dict(zip(layouts[code], pickers[code](values)))
+            for code, values in zip(self.layout_codes[index].tolist(), zip(*columns))
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the column arrays (vocabularies and keys excluded)."""
+        return self.layout_codes.nbytes + sum(column.nbytes for column in self.columns.values())
+
+
+class _ColumnarValues(ValuesView):
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self._mapping.rows()
+
+
+class _ColumnarItems(ItemsView):
+    def __iter__(self) -> Iterator:
+        return zip(self._mapping.row_keys, self._mapping.rows())
+
+
+def to_columnar(table: Mapping[str, Dict[str, Any]]) -> Mapping[str, Dict[str, Any]]:
+    """
+    ColumnarRows copy of a dict table behind a writable OverlayTable, or
+    the table itself when NumPy is not installed.
+    """
+    if np is None or not isinstance(table, dict):
+        return table
+    return OverlayTable(ColumnarRows(table))
+
+
+def columnar_store(table: Any) -> Optional[ColumnarRows]:
+    """The ColumnarRows store under a table's OverlayTable views, or None."""
+    while isinstance(table, OverlayTable):
+        table = table.base
+    return table if isinstance(table, ColumnarRows) else None
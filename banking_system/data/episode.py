@@ -0,0 +1,289 @@
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from .indexes import _MISSING, IndexRegistry
+from .sequences import SequenceIndex
+from .fragments import RowFragments
+from .temporal import TemporalColumn
+from .versions import TableVersions
+
+# Journal operations
+INSERT = "insert"
+UPDATE = "update"
+
+
+class OverlayTable(MutableMapping):
+    """
+    Copy-on-write view of one baseline table (row key -> row dict).
+
+    Reads fall through to the shared baseline rows, which must never be
+    mutated. writable(key) copies a row into the overlay the first time it
+    is written, and new rows live only in the overlay, so dropping the
+    overlay restores the baseline in O(rows touched).
+    """
+
+    def __init__(self, base: Mapping):
+        self.base = base
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self.deleted: Set[str] = set()
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        row = self.rows.get(key)
+        if row is not None:
+            return row
+        if key in self.deleted:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __setitem__(self, key: str, row: Dict[str, Any]) -> None:
+        self.rows[key] = row
+        self.deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.rows.pop(key, None)
+        if key in self.base:
+            self.deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.rows:
+            return True
+        return key not in self.deleted and key in self.base
+
+    def __iter__(self) -> Iterator[str]:
+        # Baseline order first, then rows inserted during the episode,
+        # matching the order an in-place dict would have
+        deleted = self.deleted
+        for key in self.base:
+            if key not in deleted:
+                yield key
+        base = self.base
+        for key in list(self.rows):
+            if key not in base:
+                yield key
+
+    def __len__(self) -> int:
+        added = sum(1 for key in self.rows if key not in self.base)
+        return len(self.base) - len(self.deleted) + added
+
+    def values(self) -> ValuesView:
+        return _OverlayValues(self)
+
+    def items(self) -> ItemsView:
+        return _OverlayItems(self)
+
+    def writable(self, key: str) -> Dict[str, Any]:
+        """Return the episode-private copy of a row, copying it on first write."""
+        row = self.rows.get(key)
+        if row is None:
+            row = dict(self[key])
+            self.rows[key] = row
+        return row
+
+    def reset(self) -> None:
+        self.rows.clear()
+        self.deleted.clear()
+
+
+class _OverlayValues(ValuesView):
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        table = self._mapping
+        rows, deleted = table.rows, table.deleted
+        if not rows and not deleted:
+            # Untouched table: iterate the baseline directly
+            yield from table.base.values()
+            return
+        for key, row in table.base.items():
+            if key in rows:
+                yield rows[key]
+            elif key not in deleted:
+                yield row
+        for key in list(rows):
+            if key not in table.base:
+                yield rows[key]
+
+
+class _OverlayItems(ItemsView):
+    def __iter__(self) -> Iterator:
+        table = self._mapping
+        rows, deleted = table.rows, table.deleted
+        if not rows and not deleted:
+            yield from table.base.items()
+            return
+        for key, row in table.base.items():
+            if key in rows:
+                yield key, rows[key]
+            elif key not in deleted:
+                yield key, row
+        for key in list(rows):
+            if key not in table.base:
+                yield key, rows[key]
+
+
+class EpisodeData(Mapping):
+    """
+    Per-episode view over a loaded baseline (a dict or LazyTables) that
+    behaves like config["data"]. Every table is wrapped in an OverlayTable,
+    so episodes share the baseline rows and reset() only discards the rows
+    the episode touched instead of deep-copying the dataset.
+
+    Writes must go through update_row()/insert_row() (or the module-level
+    helpers of the same name) rather than mutating rows in place. Each
+    write is recorded in an undo journal; rollback() replays it in reverse
+    back to a savepoint(), e.g. to undo the last k steps of a rollout.
+
+    indexes holds the episode's secondary indexes; they are built on first
+    use and kept in sync by every write, rollback and reset. versions
+    stamps every table on each write and rollback (see versions.py).
+    fragments caches encoded rows and is shared with the base when it has
+    one (see fragments.py).
+    """
+
+    def __init__(self, base: Mapping[str, Any]):
+        self.base = base
+        self._tables: Dict[str, OverlayTable] = {}
+        # (op, table, key, before, copied) in write order; see rollback()
+        self.journal: List[Tuple[str, str, str, Any, bool]] = []
+        self.indexes = IndexRegistry(self)
+        self.versions = TableVersions()
+        fragments = getattr(base, "fragments", None)
+        self.fragments = RowFragments() if fragments is None else fragments
+
+    def __getitem__(self, name: str) -> OverlayTable:
+        table = self._tables.get(name)
+        if table is None:
+            table = OverlayTable(self.base[name])
+            self._tables[name] = table
+        return table
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.base)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.base
+
+    def update_row(self, table: str, key: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+        overlay = self[table]
+        copied = key not in overlay.rows
+        row = overlay.writable(key)
+        before = {field: row.get(field, _MISSING) for field in changes}
+        self.journal.append((UPDATE, table, key, before, copied))
+        self.versions.bump(table)
+        self.fragments.discard(row)
+        row.update(changes)
+        self.indexes.updated(table, key, before, row)
+        return row
+
+    def insert_row(self, table: str, key: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        overlay = self[table]
+        previous = overlay.rows.get(key, _MISSING)
+        self.journal.append((INSERT, table, key, previous, False))
+        self.versions.bump(table)
+        shadowed = overlay.get(key)
+        if shadowed is not None:
+            self.indexes.removed(table, key, shadowed)
+        overlay[key] = row
+        self.indexes.added(table, key, row)
+        return row
+
+    def next_id(self, table: str) -> int:
+        """Next free numeric ID of a table; the sequence follows inserts and rollbacks."""
+        def seeded() -> SequenceIndex:
+            base_last_id = getattr(self.base, "last_id", None)
+            return SequenceIndex(base_last_id(table) if base_last_id else None)
+
+        return self.indexes.get(table, "sequence", seeded).last + 1
+
+    def temporal_column(self, table: str, field: str) -> TemporalColumn:
+        """Pre-parsed date column of a table (see temporal.py), seeded from the base."""
+        def seeded() -> TemporalColumn:
+            base_column = getattr(self.base, "temporal_column", None)
+            return TemporalColumn(field, base_column(table, field) if base_column else None)
+
+        return self.indexes.get(table, ("temporal", field), seeded)
+
+    def savepoint(self) -> int:
+        """Mark the current state; pass the result to rollback() to return to it."""
+        return len(self.journal)
+
+    def rollback(self, savepoint: int = 0) -> None:
+        """Undo every write made after savepoint, newest first, in O(writes undone)."""
+        if savepoint < 0 or savepoint > len(self.journal):
+            raise ValueError(f"Invalid savepoint {savepoint}")
+        journal, indexes = self.journal, self.indexes
+        while len(journal) > savepoint:
+            op, table, key, before, copied = journal.pop()
+            self.versions.bump(table)
+            overlay = self._tables[table]
+            current = overlay.rows[key]
+            if op == INSERT:
+                indexes.removed(table, key, current)
+                if before is _MISSING:
+                    del overlay.rows[key]
+                else:
+                    overlay.rows[key] = before
+                restored = overlay.get(key)
+                if restored is not None:
+                    indexes.added(table, key, restored)
+                continue
+
+            undone = {field: current.get(field, _MISSING) for field in before}
+            if copied:
+                # Row was still shared with the baseline before this write
+                del overlay.rows[key]
+                row = overlay.base[key]
+            else:
+                row = current
+                self.fragments.discard(row)
+                for field, value in before.items():
+                    if value is _MISSING:
+                        row.pop(field, None)
+                    else:
+                        row[field] = value
+            indexes.updated(table, key, undone, row)
+
+    def touched(self) -> Dict[str, int]:
+        """Number of overlay rows per table, i.e. the cost of the next reset()."""
+        return {
+            name: len(table.rows) + len(table.deleted)
+            for name, table in self._tables.items()
+            if table.rows or table.deleted
+        }
+
+    def reset(self) -> None:
+        # Undo through the journal so built indexes follow in O(writes)
+        self.rollback()
+        for table in self._tables.values():
+            table.reset()
+
+
+def update_row(data: Mapping[str, Any], table: str, key: str, changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply changes to data[table][key] and return the updated row. Plain
+    dict data is mutated in place; EpisodeData copies the row on write.
+    """
+    update = getattr(data, "update_row", None)
+    if update is not None:
+        return update(table, key, changes)
+    row = writable_row(data[table], key)
+    row.update(changes)
+    return row
+
+
+def writable_row(rows: Mapping[str, Any], key: str) -> Dict[str, Any]:
+    """rows[key] as a dict that persists in-place updates (see OverlayTable.writable)."""
+    writable = getattr(rows, "writable", None)
+    return rows[key] if writable is None else writable(key)
+
+
+def insert_row(data: Mapping[str, Any], table: str, key: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Store a new row as data[table][key] and return it."""
+    insert = getattr(data, "insert_row", None)
+    if insert is not None:
+        return insert(table, key, row)
+    data[table][key] = row
+    return row
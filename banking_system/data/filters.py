@@ -0,0 +1,146 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .columnar import ENCODED, ColumnarRows, np
+from .episode import OverlayTable
+
+# Predicate operations understood by filter_rows()
+EQ = "eq"              # (EQ, field, value): row.get(field) == value
+NUMERIC = "numeric"    # (NUMERIC, field): float(row.get(field)) succeeds
+RANGE = "range"        # (RANGE, field, low, high): low <= value <= high, None = unbounded
+TIME_RANGE = "time"    # (TIME_RANGE, field, low, high, missing): on to_micros values, missing for None
+CONTAINS = "contains"  # (CONTAINS, field, text): text in (row.get(field) or '').lower()
+
+Predicate = Tuple[Any, ...]
+
+_NUMBER = (int, float)
+
+
+class _Unsupported(Exception):
+    """A predicate cannot be evaluated on the arrays; the caller scans rows instead."""
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, _NUMBER)
+
+
+def _vocab_mask(column, test: Callable[[Any], bool], vocab: Optional[List[Any]] = None):
+    # Evaluate the Python predicate once per distinct value, then map the codes
+    vocab = column.vocab if vocab is None else vocab
+    hits = np.fromiter((test(value) for value in vocab), dtype=bool, count=len(vocab))
+    return hits[column.values]
+
+
+def _mask(store: ColumnarRows, predicate: Predicate):
+    op, field = predicate[0], predicate[1]
+    column = store.columns.get(field)
+    if column is None:
+        # Field absent from every row: row.get(field) is None throughout
+        if op == EQ and predicate[2] is None:
+            return np.ones(len(store), dtype=bool)
+        if op in (EQ, NUMERIC, RANGE, CONTAINS):
+            return np.zeros(len(store), dtype=bool)
+        raise _Unsupported(field)
+
+    if op == EQ:
+        value = predicate[2]
+        if column.kind == ENCODED:
+            return _vocab_mask(column, lambda v: v == value)
+        if value is None:
+            return column.nulls.copy()
+        if _number(value):
+            return (column.values == value) & ~column.nulls
+        if isinstance(value, str):
+            return np.zeros(len(store), dtype=bool)
+        raise _Unsupported(field)
+
+    if op in (NUMERIC, RANGE):
+        if column.kind == ENCODED:
+            raise _Unsupported(field)
+        mask = ~column.nulls
+        if op == RANGE:
+            low, high = predicate[2], predicate[3]
+            if not all(bound is None or _number(bound) for bound in (low, high)):
+                raise _Unsupported(field)
+            if low is not None:
+                mask &= column.values >= low
+            if high is not None:
+                mask &= column.values <= high
+        return mask
+
+    if op == TIME_RANGE:
+        if column.micros is None:
+            raise _Unsupported(field)
+        low, high, missing = predicate[2], predicate[3], predicate[4]
+        micros = np.where(column.nulls, missing, column.micros)
+        mask = np.ones(len(store), dtype=bool)
+        if low is not None:
+            mask &= micros >= low
+        if high is not None:
+            mask &= micros <= high
+        return mask
+
+    if op == CONTAINS:
+        text = predicate[2]
+        if column.kind != ENCODED or any(v and not isinstance(v, str) for v in column.vocab):
+            raise _Unsupported(field)
+        return _vocab_mask(column, lambda folded: text in folded, column.folded())
+
+    raise _Unsupported(op)
+
+
+def filter_rows(table: Mapping[str, Dict[str, Any]], predicates: Sequence[Predicate],
+                matches: Callable[[str, Dict[str, Any]], bool],
+                stop: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Rows of table satisfying every predicate, in table order, evaluated as
+    boolean masks over the column arrays of a ColumnarRows store. Rows the
+    current view overrides (OverlayTable writes, inserts) are checked with
+    matches(key, row) instead, which must implement the same predicates.
+
+    With stop, only the first stop matching rows are materialized.
+    Returns None when table is not backed by a ColumnarRows store or a
+    predicate does not map onto its arrays; callers then scan the rows.
+    """
+    levels: List[OverlayTable] = []
+    store = table
+    while isinstance(store, OverlayTable):
+        levels.append(store)
+        store = store.base
+    if np is None or not isinstance(store, ColumnarRows):
+        return None
+
+    try:
+        mask = np.ones(len(store), dtype=bool)
+        for predicate in predicates:
+            mask &= _mask(store, predicate)
+    except _Unsupported:
+        return None
+
+    positions = store.positions
+    overridden: Dict[int, Dict[str, Any]] = {}
+    added: List[str] = []
+    # Innermost view first: its new rows come before those of the views above it
+    for level in reversed(levels):
+        for key in list(level.rows) + list(level.deleted):
+            position = positions.get(key)
+            if position is None:
+                continue
+            row = table.get(key)
+            if row is not None and matches(key, row):
+                overridden[position] = row
+                mask[position] = True
+            else:
+                mask[position] = False
+        added.extend(key for key in level.rows if key not in level.base)
+
+    selected = np.flatnonzero(mask)[:stop]
+    results = store.rows_at(selected)
+    if overridden:
+        results = [overridden.get(position, row) for position, row in zip(selected.tolist(), results)]
+    for key in added:
+        if stop is not None and len(results) >= stop:
+            break
+        row = table.get(key)
+        if row is not None and matches(key, row):
+            results.append(row)
+    return results
@@ -0,0 +1,43 @@
+from typing import Any, Callable, Dict, Tuple
+
+Encoder = Callable[[Dict[str, Any]], str]
+
+
+class RowFragments:
+    """
+    Encoded JSON of rows, keyed by row identity, so list responses can be
+    joined from fragments instead of re-encoding unchanged rows. Each
+    entry holds its row, which keeps the id from being reused.
+
+    Every in-place change to a row must discard() it, as update_row() of
+    LazyTables and EpisodeData and EpisodeData rollbacks do. Baseline
+    rows under an EpisodeData are never mutated, so episodes share the
+    fragments of their base. The cache is dropped whole once it holds
+    maxsize rows.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._entries: Dict[int, Tuple[Dict[str, Any], str]] = {}
+
+    def encode(self, row: Dict[str, Any], encoder: Encoder) -> str:
+        entry = self._entries.get(id(row))
+        if entry is not None and entry[0] is row:
+            return entry[1]
+        fragment = encoder(row)
+        if len(self._entries) >= self.maxsize:
+            self._entries.clear()
+        self._entries[id(row)] = (row, fragment)
+        return fragment
+
+    def discard(self, row: Dict[str, Any]) -> None:
+        entry = self._entries.get(id(row))
+        if entry is not None and entry[0] is row:
+            del self._entries[id(row)]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
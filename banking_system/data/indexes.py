@@ -0,0 +1,379 @@
+import bisect
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Set, Tuple
+
+_MISSING = object()
+
+
+def key_order(key: str) -> Tuple[int, Any]:
+    """Sort key matching table order: numeric IDs ascending, as allocated."""
+    return (0, int(key)) if key.isdigit() else (1, key)
+
+
+def parse_timestamp(value: Any) -> datetime:
+    """ISO string or datetime to datetime; anything else sorts first (datetime.min)."""
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    if isinstance(value, datetime):
+        return value
+    return datetime.min
+
+
+class Index:
+    """
+    Derived lookup structure over one table, kept in sync with every
+    insert and update made through LazyTables or EpisodeData, and with
+    every EpisodeData rollback.
+
+    fields names the columns the index reads; updates that touch none of
+    them skip the index. None means the index depends on every column.
+    """
+
+    fields: Optional[Tuple[str, ...]] = None
+
+    def build(self, table: Mapping[str, Dict[str, Any]]) -> None:
+        for key, row in table.items():
+            self.add(key, row)
+
+    def add(self, key: str, row: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def remove(self, key: str, row: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def update(self, key: str, before: Dict[str, Any], row: Dict[str, Any]) -> None:
+        """Row key changed from the values in before to its current state."""
+        old_row = dict(row)
+        for field, value in before.items():
+            if value is _MISSING:
+                old_row.pop(field, None)
+            else:
+                old_row[field] = value
+        self.remove(key, old_row)
+        self.add(key, row)
+
+
+class PostingIndex(Index):
+    """Posting list of row keys (in table order) per value of one column."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.fields = (field,)
+        self.postings: Dict[Any, List[str]] = {}
+
+    def value(self, row: Dict[str, Any]) -> Any:
+        """The value a row is posted under."""
+        return row.get(self.field)
+
+    def add(self, key: str, row: Dict[str, Any]) -> None:
+        keys = self.postings.setdefault(self.value(row), [])
+        if keys and key_order(key) < key_order(keys[-1]):
+            # Updated or rolled-back rows go back to their table position
+            bisect.insort(keys, key, key=key_order)
+        else:
+            keys.append(key)
+
+    def remove(self, key: str, row: Dict[str, Any]) -> None:
+        value = self.value(row)
+        keys = self.postings.get(value)
+        if not keys:
+            return
+        # Rollback removes the newest rows first, which sit at the end
+        if keys[-1] == key:
+            keys.pop()
+        else:
+            keys.remove(key)
+        if not keys:
+            del self.postings[value]
+
+    def get(self, value: Any) -> List[str]:
+        try:
+            return self.postings.get(value, [])
+        except TypeError:
+            # Unhashable filter values never equal a stored column value
+            return []
+
+
+class UniqueIndex(PostingIndex):
+    """
+    Hash index on a business key such as account_number or card_number.
+    Values are expected to be unique; should duplicates appear, first()
+    returns the earliest row in table order, exactly like a linear scan.
+    """
+
+    def first(self, value: Any) -> Optional[str]:
+        keys = self.get(value)
+        return keys[0] if keys else None
+
+
+class FoldedIndex(PostingIndex):
+    """
+    Posting lists keyed by the lower-cased value of a text column, for
+    case-insensitive exact matches such as email. A missing value posts
+    as '', the same default the list_* filters lower-case.
+    """
+
+    def value(self, row: Dict[str, Any]) -> Any:
+        value = row.get(self.field, '')
+        return value.lower() if isinstance(value, str) else value
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex(Index):
+    """
+    Keys of the rows whose lower-cased text column contains each trigram,
+    for case-insensitive substring searches (names, addresses, merchants).
+    A row holding a query contains all of the query's trigrams, so the
+    intersection is a superset of the matches; callers verify each one.
+    Queries shorter than three characters cannot be narrowed.
+    """
+
+    def __init__(self, field: str):
+        self.field = field
+        self.fields = (field,)
+        self.postings: Dict[str, Set[str]] = {}
+
+    def _trigrams(self, row: Dict[str, Any]) -> Set[str]:
+        value = row.get(self.field)
+        return trigrams(value.lower()) if isinstance(value, str) else set()
+
+    def add(self, key: str, row: Dict[str, Any]) -> None:
+        for gram in self._trigrams(row):
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: str, row: Dict[str, Any]) -> None:
+        for gram in self._trigrams(row):
+            keys = self.postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.postings[gram]
+
+    def candidates(self, text: str) -> Optional[List[str]]:
+        """Keys (in table order) that may contain text, or None when text is too short."""
+        grams = trigrams(text)
+        if not grams:
+            return None
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        return sorted(postings[0].intersection(*postings[1:]), key=key_order)
+
+
+class RecentIndex(Index):
+    """
+    Row keys grouped by one column (e.g. account_id) and kept sorted by a
+    timestamp column, so the k most recent rows of a group come back in
+    O(k). Entries sort by (timestamp, -row id): read from the end, that is
+    newest first with ties in table order, the same order as a stable
+    descending sort of the group's rows.
+    """
+
+    def __init__(self, group_field: str, time_field: str):
+        self.group_field = group_field
+        self.time_field = time_field
+        self.fields = (group_field, time_field)
+        self.groups: Dict[Any, List[Tuple[datetime, int, str]]] = {}
+
+    def _entry(self, key: str, row: Dict[str, Any]) -> Tuple[datetime, int, str]:
+        tie = -int(key) if key.isdigit() else 0
+        return parse_timestamp(row.get(self.time_field)), tie, key
+
+    def add(self, key: str, row: Dict[str, Any]) -> None:
+        entries = self.groups.setdefault(row.get(self.group_field), [])
+        entry = self._entry(key, row)
+        if not entries or entries[-1] < entry:
+            entries.append(entry)
+        else:
+            bisect.insort(entries, entry)
+
+    def remove(self, key: str, row: Dict[str, Any]) -> None:
+        value = row.get(self.group_field)
+        entries = self.groups.get(value)
+        if not entries:
+            return
+        entry = self._entry(key, row)
+        pos = bisect.bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            del entries[pos]
+        if not entries:
+            del self.groups[value]
+
+    def recent(self, value: Any, count: int) -> List[str]:
+        """Keys of the count most recent rows of a group, newest first."""
+        try:
+            entries = self.groups.get(value, [])
+        except TypeError:
+            return []
+        return [entry[2] for entry in entries[:-count - 1:-1]] if count > 0 else []
+
+
+class IndexRegistry:
+    """
+    Lazily built indexes of one LazyTables or EpisodeData. An index is
+    built on first request (touching only its own table) and maintained
+    from then on. Plain dict data has no registry and is scanned.
+    """
+
+    def __init__(self, data: Mapping[str, Any]):
+        self.data = data
+        self._tables: Dict[str, Dict[Hashable, Index]] = {}
+
+    def get(self, table: str, name: Hashable, factory: Callable[[], Index]) -> Index:
+        indexes = self._tables.setdefault(table, {})
+        index = indexes.get(name)
+        if index is None:
+            index = factory()
+            index.build(self.data[table])
+            indexes[name] = index
+        return index
+
+    def drop(self, table: str) -> None:
+        """Forget the indexes of a table that was replaced wholesale."""
+        self._tables.pop(table, None)
+
+    def posting(self, table: str, field: str) -> PostingIndex:
+        return self.get(table, ("posting", field), lambda: PostingIndex(field))
+
+    def folded(self, table: str, field: str) -> FoldedIndex:
+        return self.get(table, ("folded", field), lambda: FoldedIndex(field))
+
+    def trigram(self, table: str, field: str) -> TrigramIndex:
+        return self.get(table, ("trigram", field), lambda: TrigramIndex(field))
+
+    def unique(self, table: str, field: str) -> UniqueIndex:
+        return self.get(table, ("unique", field), lambda: UniqueIndex(field))
+
+    def recent(self, table: str, group_field: str, time_field: str) -> RecentIndex:
+        return self.get(
+            table, ("recent", group_field, time_field),
+            lambda: RecentIndex(group_field, time_field)
+        )
+
+    def added(self, table: str, key: str, row: Dict[str, Any]) -> None:
+        for index in self._tables.get(table, {}).values():
+            index.add(key, row)
+
+    def removed(self, table: str, key: str, row: Dict[str, Any]) -> None:
+        for index in self._tables.get(table, {}).values():
+            index.remove(key, row)
+
+    def updated(self, table: str, key: str, before: Dict[str, Any], row: Dict[str, Any]) -> None:
+        indexes = self._tables.get(table)
+        if not indexes:
+            return
+        changed = {
+            field: value for field, value in before.items()
+            if value is _MISSING or field not in row or row[field] != value
+        }
+        if not changed:
+            return
+        for index in indexes.values():
+            if index.fields is None or any(field in changed for field in index.fields):
+                index.update(key, changed, row)
+
+
+def index_keys(data: Mapping[str, Any], table: str, field: str, value: Any) -> Optional[List[str]]:
+    """
+    Keys of the rows in data[table] whose field equals value, in table
+    order, or None when data carries no indexes and callers must scan.
+    The returned list belongs to the index and must not be modified.
+    """
+    indexes = getattr(data, "indexes", None)
+    if indexes is None:
+        return None
+    return indexes.posting(table, field).get(value)
+
+
+def candidate_keys(data: Mapping[str, Any], table: str, filters: Dict[str, Any],
+                   folded: Optional[Dict[str, Optional[str]]] = None,
+                   contains: Optional[Dict[str, Optional[str]]] = None) -> Optional[List[str]]:
+    """
+    Shortest posting list among the equality filters that are not None,
+    or None when no filter applies or data carries no indexes. folded
+    holds case-insensitive equality filters (already lower-cased), served
+    by FoldedIndex; contains holds case-insensitive substring filters
+    (lower-cased too), served by TrigramIndex when at least three
+    characters long. Callers still evaluate every predicate on the
+    candidate rows.
+    """
+    best = None
+    for field, value in filters.items():
+        if value is None:
+            continue
+        keys = index_keys(data, table, field, value)
+        if keys is None:
+            return None
+        if best is None or len(keys) < len(best):
+            best = keys
+    for field, value in (folded or {}).items():
+        if value is None:
+            continue
+        indexes = getattr(data, "indexes", None)
+        if indexes is None:
+            return None
+        keys = indexes.folded(table, field).get(value)
+        if best is None or len(keys) < len(best):
+            best = keys
+    for field, value in (contains or {}).items():
+        if not value:
+            continue
+        indexes = getattr(data, "indexes", None)
+        if indexes is None:
+            return None
+        keys = indexes.trigram(table, field).candidates(value)
+        if keys is not None and (best is None or len(keys) < len(best)):
+            best = keys
+    return best
+
+
+def find_row(data: Mapping[str, Any], table: str, field: str, value: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    (key, row) of the first row in data[table] whose field equals value,
+    or None. Uses the table's unique index when data carries indexes and
+    scans the table otherwise.
+    """
+    rows = data.get(table, {})
+    indexes = getattr(data, "indexes", None)
+    if indexes is not None:
+        key = indexes.unique(table, field).first(value)
+        return None if key is None else (key, rows[key])
+    for key, row in rows.items():
+        if row.get(field) == value:
+            return key, row
+    return None
+
+
+def recent_keys(data: Mapping[str, Any], table: str, group_field: str, value: Any,
+                time_field: str, count: int) -> Optional[List[str]]:
+    """
+    Keys of the count most recent rows of data[table] whose group_field
+    equals value, newest first, or None when data carries no indexes.
+    """
+    indexes = getattr(data, "indexes", None)
+    if indexes is None:
+        return None
+    return indexes.recent(table, group_field, time_field).recent(value, count)
+
+
+def latest_keys(data: Mapping[str, Any], table: str, group_field: str, values: Iterable[Any],
+                time_field: str) -> Optional[Dict[Any, str]]:
+    """
+    Key of the most recent row of data[table] for each group_field value
+    (values without rows are left out), or None when data carries no
+    indexes. E.g. the latest statement of each card, by period_end.
+    """
+    indexes = getattr(data, "indexes", None)
+    if indexes is None:
+        return None
+    index = indexes.recent(table, group_field, time_field)
+    latest = {}
+    for value in values:
+        keys = index.recent(value, 1)
+        if keys:
+            latest[value] = keys[0]
+    return latest
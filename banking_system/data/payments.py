@@ -0,0 +1,79 @@
+import bisect
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .indexes import Index, key_order
+from .temporal import to_micros
+
+# Unparseable occurred_at values count as datetime.min
+_OCCURRED_MIN = to_micros(datetime.min)
+
+
+class PaymentIndex(Index):
+    """
+    PAYMENT transactions per beneficiary_id, kept sorted by occurred_at
+    (see to_micros), so the payments made since a date are a bisect away.
+    make_payment uses it to total what a statement period has received.
+    """
+
+    fields = ("type", "beneficiary_id", "occurred_at")
+
+    def __init__(self):
+        self.groups: Dict[Any, List[Tuple[int, Tuple[int, Any], str]]] = {}
+
+    @staticmethod
+    def _entry(key: str, row: Dict[str, Any]) -> Tuple[int, Tuple[int, Any], str]:
+        occurred = to_micros(row.get('occurred_at'))
+        return (_OCCURRED_MIN if occurred is None else occurred), key_order(key), key
+
+    def add(self, key: str, row: Dict[str, Any]) -> None:
+        if row.get('type') != 'PAYMENT':
+            return
+        entries = self.groups.setdefault(row.get('beneficiary_id'), [])
+        entry = self._entry(key, row)
+        if not entries or entries[-1] < entry:
+            entries.append(entry)
+        else:
+            bisect.insort(entries, entry)
+
+    def remove(self, key: str, row: Dict[str, Any]) -> None:
+        if row.get('type') != 'PAYMENT':
+            return
+        value = row.get('beneficiary_id')
+        entries = self.groups.get(value)
+        if not entries:
+            return
+        entry = self._entry(key, row)
+        pos = bisect.bisect_left(entries, entry)
+        if pos < len(entries) and entries[pos] == entry:
+            del entries[pos]
+        if not entries:
+            del self.groups[value]
+
+    def since(self, beneficiary_id: Any, start: int) -> List[str]:
+        """Keys of the beneficiary's payments made at or after start (micros), in table order."""
+        try:
+            entries = self.groups.get(beneficiary_id, [])
+        except TypeError:
+            return []
+        pos = bisect.bisect_left(entries, (start,))
+        return [entry[2] for entry in sorted(entries[pos:], key=lambda entry: entry[1])]
+
+
+def payments_since(data: Mapping[str, Any], beneficiary_id: Any, start: int) -> Optional[float]:
+    """
+    Total amount of the PAYMENT transactions to a beneficiary that occurred
+    at or after start (micros), summed in table order like a scan, or None
+    when data carries no indexes.
+    """
+    indexes = getattr(data, "indexes", None)
+    if indexes is None:
+        return None
+    transactions = data['transactions']
+    total = 0.0
+    for key in indexes.get('transactions', "payments", PaymentIndex).since(beneficiary_id, start):
+        try:
+            total += float(transactions[key].get('amount', 0))
+        except (TypeError, ValueError):
+            continue
+    return total
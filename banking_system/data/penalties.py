@@ -0,0 +1,128 @@
+import bisect
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .indexes import Index, key_order
+
+# (product_type, product_subtype)
+Group = Tuple[Any, Any]
+
+
+class PenaltyBands:
+    """
+    Overdue-day bands of one product group, for O(log n) lookups. The
+    bands' ends cut the day axis into segments, each holding the keys (in
+    table order) of the bands that cover all of it; a lookup bisects to
+    its segment. Bands may overlap or leave gaps, and a band covers d when
+    days_overdue_from <= d and d <= days_overdue_to (when not None).
+    """
+
+    def __init__(self, bands: Iterable[Tuple[str, Any, Any]]):
+        # (key, days_overdue_from, days_overdue_to), in table order
+        bands = list(bands)
+        # A band starts at (from, 0) and ends before (to, 1); day d queries as (d, 0)
+        self.bounds: List[Tuple[Any, int]] = sorted(
+            {(start, 0) for _, start, _ in bands} | {(end, 1) for _, _, end in bands if end is not None}
+        )
+        self.segments: List[Tuple[str, ...]] = [
+            tuple(key for key, start, end in bands
+                  if (start, 0) <= bound and (end is None or bound < (end, 1)))
+            for bound in self.bounds
+        ]
+
+    def keys(self, days: Any) -> Tuple[str, ...]:
+        """Keys of every band covering days, in table order."""
+        pos = bisect.bisect_right(self.bounds, (days, 0)) - 1
+        return self.segments[pos] if pos >= 0 else ()
+
+    def first(self, days: Any) -> Optional[str]:
+        """Key of the first band (in table order) covering days, or None."""
+        keys = self.keys(days)
+        return keys[0] if keys else None
+
+    def first_many(self, days: Sequence[Any]) -> List[Optional[str]]:
+        """first() of each overdue-day count, e.g. for a late-fee sweep."""
+        firsts = [keys[0] if keys else None for keys in self.segments]
+        found = []
+        for count in days:
+            pos = bisect.bisect_right(self.bounds, (count, 0)) - 1
+            found.append(firsts[pos] if pos >= 0 else None)
+        return found
+
+
+def _band(key: str, rate: Mapping[str, Any]) -> Tuple[str, Any, Any]:
+    return key, rate.get('days_overdue_from', 0), rate.get('days_overdue_to')
+
+
+class PenaltyRateIndex(Index):
+    """
+    penalty_rates grouped by (product_type, product_subtype), with the
+    PenaltyBands of a group built on first use and dropped when one of
+    its rates is added, changed or removed.
+    """
+
+    fields = ("product_type", "product_subtype", "days_overdue_from", "days_overdue_to")
+
+    def __init__(self):
+        self.groups: Dict[Group, Dict[str, Tuple[str, Any, Any]]] = {}
+        self._bands: Dict[Group, PenaltyBands] = {}
+
+    def add(self, key: str, row: Dict[str, Any]) -> None:
+        group = (row.get('product_type'), row.get('product_subtype'))
+        self.groups.setdefault(group, {})[key] = _band(key, row)
+        self._bands.pop(group, None)
+
+    def remove(self, key: str, row: Dict[str, Any]) -> None:
+        group = (row.get('product_type'), row.get('product_subtype'))
+        bands = self.groups.get(group)
+        if bands is None or bands.pop(key, None) is None:
+            return
+        if not bands:
+            del self.groups[group]
+        self._bands.pop(group, None)
+
+    def bands(self, group: Group) -> PenaltyBands:
+        found = self._bands.get(group)
+        if found is None:
+            rates = self.groups.get(group, {})
+            found = self._bands[group] = PenaltyBands(rates[key] for key in sorted(rates, key=key_order))
+        return found
+
+
+def penalty_bands(data: Mapping[str, Any], product_type: Any) -> Dict[Any, PenaltyBands]:
+    """
+    PenaltyBands of each product_subtype of product_type: from the index
+    when data carries indexes, built in one pass over penalty_rates
+    otherwise (so build them once per batch, not per lookup).
+    """
+    indexes = getattr(data, "indexes", None)
+    if indexes is not None:
+        index = indexes.get('penalty_rates', "bands", PenaltyRateIndex)
+        return {subtype: index.bands((ptype, subtype)) for ptype, subtype in index.groups if ptype == product_type}
+    grouped: Dict[Any, List[Tuple[str, Any, Any]]] = {}
+    for key, rate in data.get('penalty_rates', {}).items():
+        if rate.get('product_type') == product_type:
+            grouped.setdefault(rate.get('product_subtype'), []).append(_band(key, rate))
+    return {subtype: PenaltyBands(bands) for subtype, bands in grouped.items()}
+
+
+def penalty_rate_keys(data: Mapping[str, Any], product_type: Any, product_subtype: Any,
+                      overdue_days: Any) -> Optional[List[str]]:
+    """
+    Keys of the penalty rates list_penalty_rates would return, in table
+    order, or None when data carries no indexes. Falsy product_type or
+    product_subtype match every group, as in list_penalty_rates.
+    """
+    indexes = getattr(data, "indexes", None)
+    if indexes is None:
+        return None
+    index = indexes.get('penalty_rates', "bands", PenaltyRateIndex)
+    keys: List[str] = []
+    for group in index.groups:
+        if (product_type and group[0] != product_type) or (product_subtype and group[1] != product_subtype):
+            continue
+        if overdue_days is None:
+            keys.extend(index.groups[group])
+        else:
+            keys.extend(index.bands(group).keys(overdue_days))
+    keys.sort(key=key_order)
+    return keys
@@ -0,0 +1,55 @@
+from typing import Any, Dict, List, Mapping, Optional
+
+from .indexes import Index
+
+
+def max_id(table: Mapping[str, Any]) -> int:
+    """Largest numeric row key of a table, 0 when it has none."""
+    return max((int(key) for key in table if key.isdigit()), default=0)
+
+
+class SequenceIndex(Index):
+    """
+    Per-table ID sequence: tracks the largest numeric key so the next ID
+    is last + 1 without scanning the table. Row keys never change on
+    update, and rollback removes inserted rows newest first, so undoing an
+    insert restores the previous maximum from a stack.
+    """
+
+    fields = ()
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self.last = 0
+        self._previous: List[int] = []
+
+    def build(self, table: Mapping[str, Dict[str, Any]]) -> None:
+        if self.seed is None:
+            self.last = max_id(table)
+            return
+        # Seeded from the baseline: only rows added on top of it can raise the maximum
+        self.last = self.seed
+        for key in getattr(table, "rows", ()):
+            self.add(key, None)
+
+    def add(self, key: str, row: Optional[Dict[str, Any]]) -> None:
+        if key.isdigit() and int(key) > self.last:
+            self._previous.append(self.last)
+            self.last = int(key)
+
+    def remove(self, key: str, row: Optional[Dict[str, Any]]) -> None:
+        if key.isdigit() and int(key) == self.last and self._previous:
+            self.last = self._previous.pop()
+
+
+def next_id(data: Mapping[str, Any], table: str) -> int:
+    """
+    Next free numeric ID for data[table], i.e. the largest existing ID plus
+    one. Data that keeps sequences (LazyTables, EpisodeData) answers in
+    O(1); plain dict data falls back to scanning the keys. Allocation does
+    not reserve the ID; inserting the row advances the sequence.
+    """
+    allocate = getattr(data, "next_id", None)
+    if allocate is not None:
+        return allocate(table)
+    return max_id(data.get(table, {})) + 1
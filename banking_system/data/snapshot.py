@@ -0,0 +1,95 @@
+import os
+import json
+import pickle
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+
+from .sequences import max_id
+
+SNAPSHOT_VERSION = 2
+PICKLE_PROTOCOL = 5
+
+_MISSING = object()
+
+
+def default_cache_dir(directory: str) -> str:
+    """
+    Snapshots live next to the data files in __pycache__ (like bytecode),
+    unless BANKING_SYSTEM_CACHE_DIR points somewhere else.
+    """
+    return os.environ.get("BANKING_SYSTEM_CACHE_DIR") or os.path.join(directory, "__pycache__")
+
+
+def snapshot_path(cache_dir: str, name: str) -> str:
+    return os.path.join(cache_dir, f"{name}.snapshot.pickle")
+
+
+def fingerprint(raw: bytes, file_path: str) -> Dict[str, Any]:
+    # A snapshot is only valid for the exact source file it was built from
+    stat = os.stat(file_path)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "size": len(raw),
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(raw).hexdigest(),
+    }
+
+
+def read_snapshot(path: str, key: Dict[str, Any]) -> Any:
+    """
+    Return the payload stored at path if its header matches key, otherwise
+    _MISSING. The header is pickled separately so stale snapshots are
+    rejected without unpickling the table.
+    """
+    try:
+        with open(path, "rb") as file:
+            header = pickle.load(file)
+            if header != key:
+                return _MISSING
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return _MISSING
+
+
+def write_snapshot(path: str, key: Dict[str, Any], payload: Dict[str, Any]) -> bool:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as file:
+            pickle.dump(key, file, protocol=PICKLE_PROTOCOL)
+            pickle.dump(payload, file, protocol=PICKLE_PROTOCOL)
+        # Atomic so concurrently starting workers never see a partial file
+        os.replace(tmp_path, path)
+        return True
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+def load_table_cached(file_path: str, name: str, cache_dir: Optional[str] = None) -> Tuple[Any, Optional[int]]:
+    """
+    Load one JSON table through the binary snapshot cache. A snapshot is
+    used when the source file's size, mtime and sha256 all match the ones
+    it was written for; otherwise the JSON is parsed and the snapshot is
+    rewritten. An unwritable cache directory only disables the cache.
+
+    Returns the table and its ID sequence seed (largest numeric row key),
+    which is stored in the snapshot so it is not recomputed at load.
+    """
+    with open(file_path, "rb") as file:
+        raw = file.read()
+    key = fingerprint(raw, file_path)
+    path = snapshot_path(cache_dir or default_cache_dir(os.path.dirname(file_path)), name)
+
+    payload = read_snapshot(path, key)
+    if payload is _MISSING:
+        table = json.loads(raw)
+        payload = {
+            "table": table,
+            "last_id": max_id(table) if isinstance(table, dict) else None,
+        }
+        write_snapshot(path, key, payload)
+    return payload["table"], payload["last_id"]
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+
+from .indexes import Index
+
+DAY_MICROS = 86_400_000_000
+
+
+def to_micros(value: Any) -> Optional[int]:
+    """
+    ISO string or datetime to microseconds since 0001-01-01 (proleptic
+    ordinal), None when the value does not parse. Integers compare exactly
+    like the datetimes they came from; aware values are taken in UTC.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.utcoffset() is not None:
+        value = value.astimezone(timezone.utc)
+    seconds = (value.toordinal() * 24 + value.hour) * 3600 + value.minute * 60 + value.second
+    return seconds * 1_000_000 + value.microsecond
+
+
+class TemporalColumn(Index):
+    """
+    Parsed values (see to_micros) of one date column by row key. Seeded
+    with the baseline's column, only rows written during the episode are
+    parsed again.
+    """
+
+    def __init__(self, field: str, seed: Optional[Mapping[str, Optional[int]]] = None):
+        self.field = field
+        self.fields = (field,)
+        self.seed = seed
+        self.values: Dict[str, Optional[int]] = {}
+
+    def build(self, table: Mapping[str, Dict[str, Any]]) -> None:
+        if self.seed is None:
+            super().build(table)
+            return
+        for key in getattr(table, "rows", ()):
+            self.add(key, table[key])
+
+    def add(self, key: str, row: Dict[str, Any]) -> None:
+        self.values[key] = to_micros(row.get(self.field))
+
+    def remove(self, key: str, row: Dict[str, Any]) -> None:
+        self.values.pop(key, None)
+
+    def get(self, key: str) -> Optional[int]:
+        if key in self.values or self.seed is None:
+            return self.values.get(key)
+        return self.seed.get(key)
+
+
+class _ParsedView:
+    """Column accessor for plain dict data: parses on every lookup."""
+
+    def __init__(self, table: Mapping[str, Dict[str, Any]], field: str):
+        self.table = table
+        self.field = field
+
+    def get(self, key: str) -> Optional[int]:
+        row = self.table.get(key)
+        return None if row is None else to_micros(row.get(self.field))
+
+
+def parse_column(table: Mapping[str, Dict[str, Any]], field: str) -> Dict[str, Optional[int]]:
+    return {key: to_micros(row.get(field)) for key, row in table.items()}
+
+
+def temporal_column(data: Mapping[str, Any], table: str, field: str):
+    """
+    Pre-parsed values of data[table][key][field] by row key, exposed through
+    get(key). LazyTables parses a column once per process and EpisodeData
+    keeps it in sync with its writes; plain dict data parses on lookup.
+    """
+    column = getattr(data, "temporal_column", None)
+    if column is not None and table in data:
+        return column(table, field)
+    return _ParsedView(data.get(table, {}), field)
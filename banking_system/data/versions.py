@@ -0,0 +1,33 @@
+import itertools
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+# One clock for every data object, so a stamp is never reused
+_CLOCK = itertools.count(1)
+
+
+class TableVersions:
+    """
+    Write stamps per table of one data object (LazyTables, EpisodeData).
+    Every write, rollback or table replacement gives the table a fresh
+    stamp. Tables never written carry the object's own token, so equal
+    stamps always mean the same object in the same state, across objects
+    and across episodes.
+    """
+
+    def __init__(self):
+        self.token = next(_CLOCK)
+        self._stamps: Dict[str, int] = {}
+
+    def bump(self, table: str) -> None:
+        self._stamps[table] = next(_CLOCK)
+
+    def get(self, table: str) -> int:
+        return self._stamps.get(table, self.token)
+
+
+def table_versions(data: Mapping[str, Any], tables: Sequence[str]) -> Optional[Tuple[int, ...]]:
+    """Stamps of the given tables, or None when data does not track its writes (plain dicts)."""
+    versions = getattr(data, "versions", None)
+    if versions is None:
+        return None
+    return tuple(versions.get(table) for table in tables)
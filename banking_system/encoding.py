@@ -0,0 +1,62 @@
+import os
+import json
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses fall back to the stdlib encoder
+    orjson = None
+
+from .data import RowFragments, columnar_store
+
+# "json" (default) keeps responses byte-identical to json.dumps; "auto" uses
+# orjson when it is installed (compact separators, non-ASCII left unescaped)
+JSON_ENCODER = os.environ.get("BANKING_SYSTEM_JSON_ENCODER", "json")
+
+USE_ORJSON = orjson is not None and JSON_ENCODER in ("auto", "orjson")
+
+
+def _stdlib_dumps(value: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    return json.dumps(value, default=default)
+
+
+def _orjson_dumps(value: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    return orjson.dumps(value, default=default).decode()
+
+
+# Encoder of every function response: dumps(value, default=None) -> str
+dumps = _orjson_dumps if USE_ORJSON else _stdlib_dumps
+
+# Separators the encoder puts between items and after keys, for responses
+# assembled from pre-encoded fragments
+ITEM_SEPARATOR, KEY_SEPARATOR = (",", ":") if USE_ORJSON else (", ", ": ")
+
+
+def row_fragments(data: Mapping[str, Any], table: str) -> Optional[RowFragments]:
+    """
+    Fragment cache for the rows of data[table], or None when data does not
+    track its writes (plain dicts) or the table is columnar, whose rows are
+    built afresh on every read.
+    """
+    fragments = getattr(data, "fragments", None)
+    if fragments is None or columnar_store(data.get(table)) is not None:
+        return None
+    return fragments
+
+
+def dumps_rows(rows: Iterable[Dict[str, Any]], fragments: Optional[RowFragments] = None) -> str:
+    """
+    dumps(list(rows)), built from the per-row fragments cached in fragments
+    so unchanged rows are encoded once (see data/fragments.py).
+    """
+    if fragments is None:
+        return dumps(list(rows))
+    encode = fragments.encode
+    return "[" + ITEM_SEPARATOR.join([encode(row, dumps) for row in rows]) + "]"
+
+
+def dumps_object(members: Dict[str, str]) -> str:
+    """JSON object from already-encoded member values, in the encoder's format."""
+    return "{" + ITEM_SEPARATOR.join(
+        dumps(name) + KEY_SEPARATOR + value for name, value in members.items()
+    ) + "}"
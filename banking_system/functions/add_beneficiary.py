@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict, Optional
 from src.classes.function import Function
+from ..data import insert_row, next_id
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -15,7 +16,6 @@ class AddBeneficiary(Function):
         swift_code: Optional[str] = None
     ) -> str:
         customers = data.get('customers', {})
-        beneficiaries = data.get('beneficiaries', {})
 
         # Validate customer_id
         if not isinstance(customer_id, int):
@@ -45,8 +45,7 @@ class AddBeneficiary(Function):
             return "Error: 'swift_code' must be a string"
 
         # Generate new beneficiary_id
-        existing_ids = [int(bid) for bid in beneficiaries.keys() if bid.isdigit()]
-        new_id = str(max(existing_ids) + 1) if existing_ids else "1"
+        new_id = str(next_id(data, 'beneficiaries'))
 
         now_str = datetime.now().isoformat()
 
@@ -60,9 +59,9 @@ class AddBeneficiary(Function):
             "added_at": now_str
         }
 
-        beneficiaries[new_id] = beneficiary
+        insert_row(data, 'beneficiaries', new_id, beneficiary)
 
-        return json.dumps({
+        return dumps({
             "message": "Beneficiary added successfully",
             "beneficiary": beneficiary
         }, default=str)
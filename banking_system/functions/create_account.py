@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict
 from src.classes.function import Function
+from ..data import insert_row, next_id
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -26,8 +27,7 @@ class CreateAccount(Function):
             return "Error: 'initial_deposit' must be an integer"
 
         # Generate new account_id
-        existing_ids = [int(aid) for aid in accounts.keys() if aid.isdigit()]
-        new_id_int = max(existing_ids) + 1 if existing_ids else 1
+        new_id_int = next_id(data, 'accounts')
         new_id = str(new_id_int)
 
         now = datetime.now()
@@ -61,9 +61,9 @@ class CreateAccount(Function):
             "updated_at": now_str
         }
 
-        accounts[new_id] = account
+        insert_row(data, 'accounts', new_id, account)
 
-        return json.dumps({
+        return dumps({
             "message": "Account created successfully",
             "account": account
         }, default=str)
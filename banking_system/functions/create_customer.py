@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict, Optional
 from src.classes.function import Function
+from ..data import insert_row, next_id
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -15,8 +16,6 @@ class CreateCustomer(Function):
         phone: str,
         address: str
     ) -> str:
-        customers = data.get('customers', {})
-
         # Validate and normalize date of birth (string input)
         try:
             parsed_dob = datetime.fromisoformat(dob).date()
@@ -25,8 +24,7 @@ class CreateCustomer(Function):
             return "Error: 'dob' must be a string in YYYY-MM-DD format"
 
         # Generate new customer ID
-        existing_ids = [int(cid) for cid in customers.keys() if cid.isdigit()]
-        new_id = str(max(existing_ids) + 1) if existing_ids else "1"
+        new_id = str(next_id(data, 'customers'))
 
         now_str = datetime.now().isoformat()
 
@@ -44,9 +42,9 @@ class CreateCustomer(Function):
             "updated_at": now_str
         }
 
-        customers[new_id] = customer
+        insert_row(data, 'customers', new_id, customer)
 
-        return json.dumps({
+        return dumps({
             "message": "Customer created successfully",
             "customer": customer
         }, default=str)
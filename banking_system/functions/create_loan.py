@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict
 from src.classes.function import Function
+from ..data import insert_row, next_id
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -60,8 +61,7 @@ class CreateLoan(Function):
             return "Error: 'start_date' must be a string in YYYY-MM-DD format"
 
         # Generate new loan_id
-        existing_ids = [int(lid) for lid in loans.keys() if lid.isdigit()]
-        new_id_int = max(existing_ids) + 1 if existing_ids else 1
+        new_id_int = next_id(data, 'loans')
         new_id = str(new_id_int)
 
         # Determine loan_account_number: one more than the previous loan's number
@@ -93,9 +93,9 @@ class CreateLoan(Function):
             "created_at": now_str
         }
 
-        loans[new_id] = loan
+        insert_row(data, 'loans', new_id, loan)
 
-        return json.dumps({
+        return dumps({
             "message": "Loan created successfully",
             "loan": loan
         }, default=str)
@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict
 from src.classes.function import Function
+from ..data import insert_row, next_id, update_row
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -13,7 +14,6 @@ class DepositToAccount(Function):
         channel: str
     ) -> str:
         accounts = data.get('accounts', {})
-        transactions = data.get('transactions', {})
 
         # Validate account_id
         if not isinstance(account_id, int):
@@ -42,12 +42,13 @@ class DepositToAccount(Function):
         # Update account balance
         current_balance = float(account.get('balance', 0))
         new_balance = current_balance + amount
-        account['balance'] = round(new_balance, 2)
-        account['updated_at'] = datetime.now().isoformat()
+        update_row(data, 'accounts', acct_key, {
+            'balance': round(new_balance, 2),
+            'updated_at': datetime.now().isoformat()
+        })
 
         # Generate new transaction_id
-        existing_ids = [int(tid) for tid in transactions.keys() if tid.isdigit()]
-        new_txn_id = str(max(existing_ids) + 1) if existing_ids else "1"
+        new_txn_id = str(next_id(data, 'transactions'))
 
         now = datetime.now().isoformat()
 
@@ -65,9 +66,9 @@ class DepositToAccount(Function):
             "card_tx_status": None,
             "created_at": now
         }
-        transactions[new_txn_id] = txn
+        insert_row(data, 'transactions', new_txn_id, txn)
 
-        return json.dumps({
+        return dumps({
             "message": "Deposit successful",
             "transaction": txn
         }, default=str)
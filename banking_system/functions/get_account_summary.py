@@ -1,6 +1,8 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..data import candidate_keys, recent_keys
+from ..encoding import dumps
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -9,7 +11,8 @@ class GetAccountSummary(Function):
     def apply(
         data: Dict[str, Any],
         account_id: int,
-        recent_txns_count: Optional[int] = 3
+        recent_txns_count: Optional[int] = 3,
+        fields: Optional[List[str]] = None
     ) -> str:
         # account_id is required and must be int or int-like string
         try:
@@ -23,6 +26,10 @@ class GetAccountSummary(Function):
         except (ValueError, TypeError):
             return "Error: 'recent_txns_count' must be an integer"
 
+        projection = Projection.parse('transactions', fields, data.get('transactions', {}))
+        if isinstance(projection, str):
+            return projection
+
         accounts = data.get('accounts', {})
         transactions = data.get('transactions', {})
 
@@ -42,9 +49,21 @@ class GetAccountSummary(Function):
         balance = account.get('balance')
         status = account.get('status')
 
+        # Most recent first straight from the per-account time index
+        recent = recent_keys(data, 'transactions', 'account_id', acct_id, 'occurred_at', count) if count >= 0 else None
+        if recent is not None:
+            summary = {
+                "balance": balance,
+                "status": status,
+                "recent_txns": projection.rows([transactions[k] for k in recent])
+            }
+            return dumps(summary, default=str)
+
         # Collect and sort transactions for this account
+        txn_keys = candidate_keys(data, 'transactions', {'account_id': acct_id})
+        candidates = transactions.values() if txn_keys is None else (transactions[k] for k in txn_keys)
         filtered_txns = [
-            txn for txn in transactions.values()
+            txn for txn in candidates
             if txn.get('account_id') == acct_id
         ]
 
@@ -66,9 +85,9 @@ class GetAccountSummary(Function):
         summary = {
             "balance": balance,
             "status": status,
-            "recent_txns": recent_txns
+            "recent_txns": projection.rows(recent_txns)
         }
-        return json.dumps(summary, default=str)
+        return dumps(summary, default=str)
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -87,7 +106,8 @@ class GetAccountSummary(Function):
                         "recent_txns_count": {
                             "type": "integer",
                             "description": "Number of recent transactions to include (default 3)"
-                        }
+                        },
+                        **PROJECTION_PROPERTIES
                     },
                     "required": ["account_id"]
                 }
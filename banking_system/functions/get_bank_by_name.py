@@ -1,6 +1,8 @@
-import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..data import candidate_keys
+from ..encoding import dumps
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -8,16 +10,23 @@ class GetBankByName(Function):
     @staticmethod
     def apply(
         data: Dict[str, Any],
-        name: str
+        name: str,
+        fields: Optional[List[str]] = None
     ) -> str:
+        projection = Projection.parse('banks', fields, data.get('banks', {}))
+        if isinstance(projection, str):
+            return projection
+
         banks = data.get('banks', {})
         name_lower = name.lower()
 
-        # Partial, case-insensitive match on bank name
-        for bank in banks.values():
+        # Partial, case-insensitive match on bank name; the trigram index narrows the scan
+        bank_keys = candidate_keys(data, 'banks', {}, contains={'name': name_lower})
+        candidates = banks.values() if bank_keys is None else (banks[k] for k in bank_keys)
+        for bank in candidates:
             bank_name = bank.get('name', '')
             if name_lower in bank_name.lower():
-                return json.dumps(bank)
+                return dumps(projection.row(bank))
 
         return f"Error: Bank matching '{name}' not found"
 
@@ -34,7 +43,8 @@ class GetBankByName(Function):
                         "name": {
                             "type": "string",
                             "description": "Partial or full name of the bank (case-insensitive)"
-                        }
+                        },
+                        **PROJECTION_PROPERTIES
                     },
                     "required": ["name"]
                 }
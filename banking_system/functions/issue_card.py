@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict, Optional
 from src.classes.function import Function
+from ..data import insert_row, next_id
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -52,8 +53,7 @@ class IssueCard(Function):
             init_limit = 0.0
 
         # Generate new card_id
-        existing_ids = [int(cid) for cid in cards.keys() if cid.isdigit()]
-        new_id_int = max(existing_ids) + 1 if existing_ids else 1
+        new_id_int = next_id(data, 'cards')
         new_id = str(new_id_int)
 
         # Generate card_number: use previous ID’s card_number + 1
@@ -84,9 +84,9 @@ class IssueCard(Function):
             "updated_at": now_iso
         }
 
-        cards[new_id] = card
+        insert_row(data, 'cards', new_id, card)
 
-        return json.dumps({
+        return dumps({
             "message": "Card issued successfully",
             "card": card
         }, default=str)
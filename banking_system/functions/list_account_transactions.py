@@ -1,6 +1,12 @@
-import json
-from typing import Any, Dict, Optional
+from itertools import islice
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
+from ..data import (
+    CONTAINS, EQ, NUMERIC, RANGE, TIME_RANGE, candidate_keys, filter_rows, temporal_column, to_micros
+)
 from datetime import datetime
 
 
@@ -19,10 +25,21 @@ class ListAccountTransactions(Function):
         beneficiary_id: Optional[int] = None,
         card_id: Optional[int] = None,
         merchant: Optional[str] = None,
-        card_tx_status: Optional[str] = None
+        card_tx_status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('transactions', fields, data.get('transactions', {}))
+        if isinstance(projection, str):
+            return projection
+
         transactions = data.get('transactions', {})
-        results = []
 
         merchant_lower = merchant.lower() if merchant else None
 
@@ -40,26 +57,21 @@ class ListAccountTransactions(Function):
             except ValueError:
                 return "Error: 'occurred_to' must be an ISO datetime string"
 
-        def parse_date(t: Dict[str, Any]) -> datetime:
-            occ = t.get('occurred_at')
-            if isinstance(occ, str):
-                try:
-                    return datetime.fromisoformat(occ)
-                except ValueError:
-                    pass
-            if isinstance(occ, datetime):
-                return occ
-            return datetime.min
+        # Pre-parsed occurred_at; unparseable values sort as datetime.min
+        occurred = temporal_column(data, 'transactions', 'occurred_at')
+        occ_from = to_micros(occ_from_dt) if occ_from_dt else None
+        occ_to = to_micros(occ_to_dt) if occ_to_dt else None
+        occ_min = to_micros(datetime.min)
 
-        for txn in transactions.values():
+        def matches(key: str, txn: Dict[str, Any]) -> bool:
             if transaction_id is not None and txn.get('transaction_id') != transaction_id:
-                continue
+                return False
             if account_id is not None and txn.get('account_id') != account_id:
-                continue
+                return False
             if type and txn.get('type') != type:
-                continue
+                return False
             if channel and txn.get('channel') != channel:
-                continue
+                return False
 
             # Amount range (floats allowed)
             amt = txn.get('amount')
@@ -67,31 +79,70 @@ class ListAccountTransactions(Function):
                 amt_val = float(amt)
             except (TypeError, ValueError):
                 # If amount is not numeric, skip this txn
-                continue
+                return False
             if amount_min is not None and amt_val < float(amount_min):
-                continue
+                return False
             if amount_max is not None and amt_val > float(amount_max):
-                continue
+                return False
 
-            occ_dt = parse_date(txn)
-            if occ_from_dt and occ_dt < occ_from_dt:
-                continue
-            if occ_to_dt and occ_dt > occ_to_dt:
-                continue
+            if occ_from is not None or occ_to is not None:
+                occ = occurred.get(key)
+                if occ is None:
+                    occ = occ_min
+                if occ_from is not None and occ < occ_from:
+                    return False
+                if occ_to is not None and occ > occ_to:
+                    return False
 
             if beneficiary_id is not None and txn.get('beneficiary_id') != beneficiary_id:
-                continue
+                return False
             if card_id is not None and txn.get('card_id') != card_id:
-                continue
+                return False
 
             if merchant_lower and merchant_lower not in (txn.get('merchant') or '').lower():
-                continue
+                return False
             if card_tx_status and txn.get('card_tx_status') != card_tx_status:
-                continue
+                return False
+            return True
+
+        # Column arrays (columnar store): evaluate every filter as a boolean mask
+        try:
+            amount_range = (
+                None if amount_min is None else float(amount_min),
+                None if amount_max is None else float(amount_max)
+            )
+        except (TypeError, ValueError):
+            amount_range = None
+        if amount_range is not None:
+            predicates = [(NUMERIC, 'amount')]
+            if amount_range != (None, None):
+                predicates.append((RANGE, 'amount') + amount_range)
+            for field, value in (('transaction_id', transaction_id), ('account_id', account_id),
+                                 ('beneficiary_id', beneficiary_id), ('card_id', card_id)):
+                if value is not None:
+                    predicates.append((EQ, field, value))
+            for field, value in (('type', type), ('channel', channel), ('card_tx_status', card_tx_status)):
+                if value:
+                    predicates.append((EQ, field, value))
+            if occ_from is not None or occ_to is not None:
+                predicates.append((TIME_RANGE, 'occurred_at', occ_from, occ_to, occ_min))
+            if merchant_lower:
+                predicates.append((CONTAINS, 'merchant', merchant_lower))
+            rows = filter_rows(transactions, predicates, matches, stop=page.stop)
+            if rows is not None:
+                return page.dumps(rows, projection, row_fragments(data, 'transactions'))
 
-            results.append(txn)
+        # Only visit rows sharing the most selective indexed foreign key or merchant trigrams
+        txn_keys = candidate_keys(data, 'transactions', {
+            'account_id': account_id,
+            'card_id': card_id,
+            'beneficiary_id': beneficiary_id
+        }, contains={'merchant': merchant_lower})
+        candidates = transactions.items() if txn_keys is None else ((k, transactions[k]) for k in txn_keys)
+        # A page without order_by only needs the first page.stop matches
+        results = list(islice((txn for key, txn in candidates if matches(key, txn)), page.stop))
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'transactions'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -152,7 +203,9 @@ class ListAccountTransactions(Function):
                         "card_tx_status": {
                             "type": "string",
                             "description": "Card transaction status (exact match: UNBILLED, BILLED)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
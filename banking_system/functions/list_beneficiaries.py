@@ -1,6 +1,8 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -12,8 +14,20 @@ class ListBeneficiaries(Function):
         name: Optional[str] = None,
         swift_code: Optional[str] = None,
         beneficiary_type: Optional[str] = None,
-        account_number: Optional[str] = None
+        account_number: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('beneficiaries', fields, data.get('beneficiaries', {}))
+        if isinstance(projection, str):
+            return projection
+
         beneficiaries = data.get('beneficiaries', {})
         results = []
 
@@ -44,7 +58,7 @@ class ListBeneficiaries(Function):
 
             results.append(ben)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'beneficiaries'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -75,7 +89,9 @@ class ListBeneficiaries(Function):
                         "account_number": {
                             "type": "string",
                             "description": "Account number (exact match)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
@@ -1,6 +1,9 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..data import candidate_keys
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -13,8 +16,20 @@ class ListBranches(Function):
         name: Optional[str] = None,
         address: Optional[str] = None,
         swift_code: Optional[str] = None,
-        contact_number: Optional[str] = None
+        contact_number: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('branches', fields, data.get('branches', {}))
+        if isinstance(projection, str):
+            return projection
+
         branches = data.get('branches', {})
         results = []
 
@@ -22,7 +37,14 @@ class ListBranches(Function):
         address_lower = address.lower() if address else None
         swift_lower = swift_code.lower() if swift_code else None
 
-        for bid, branch in branches.items():
+        # Only visit rows matching the most selective filter (bank, SWIFT code, name, address)
+        branch_keys = candidate_keys(data, 'branches', {
+            'bank_id': bank_id,
+            'contact_number': contact_number or None
+        }, folded={'swift_code': swift_lower}, contains={'name': name_lower, 'address': address_lower})
+        candidates = branches.items() if branch_keys is None else ((k, branches[k]) for k in branch_keys)
+
+        for bid, branch in candidates:
             # Filter by branch_id (exact)
             if branch_id is not None:
                 try:
@@ -53,7 +75,7 @@ class ListBranches(Function):
 
             results.append(branch)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'branches'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -88,7 +110,9 @@ class ListBranches(Function):
                         "contact_number": {
                             "type": "string",
                             "description": "Contact number (exact match)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
@@ -1,6 +1,9 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
+from ..data import DAY_MICROS, temporal_column
 from datetime import datetime
 
 
@@ -13,8 +16,20 @@ class ListCardStatements(Function):
         period_end_to: Optional[str] = None,
         status: Optional[str] = None,
         total_due_min: Optional[int] = None,
-        total_due_max: Optional[int] = None
+        total_due_max: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('card_statements', fields, data.get('card_statements', {}))
+        if isinstance(projection, str):
+            return projection
+
         statements = data.get('card_statements', {})
         results = []
 
@@ -28,6 +43,10 @@ class ListCardStatements(Function):
 
         ps_filter = parse_date_str(period_start_from)
         pe_filter = parse_date_str(period_end_to)
+        ps_day = ps_filter.toordinal() if ps_filter else None
+        pe_day = pe_filter.toordinal() if pe_filter else None
+        period_start = temporal_column(data, 'card_statements', 'period_start')
+        period_end = temporal_column(data, 'card_statements', 'period_end')
 
         for sid, stmt in statements.items():
             # Filter by card_id (exact)
@@ -35,14 +54,16 @@ class ListCardStatements(Function):
                 continue
 
             # Filter by period_start_from (inclusive)
-            ps = parse_date_str(stmt.get('period_start'))
-            if ps_filter and (ps is None or ps < ps_filter):
-                continue
+            if ps_day is not None:
+                ps = period_start.get(sid)
+                if ps is None or ps // DAY_MICROS < ps_day:
+                    continue
 
             # Filter by period_end_to (inclusive)
-            pe = parse_date_str(stmt.get('period_end'))
-            if pe_filter and (pe is None or pe > pe_filter):
-                continue
+            if pe_day is not None:
+                pe = period_end.get(sid)
+                if pe is None or pe // DAY_MICROS > pe_day:
+                    continue
 
             # Filter by status (exact, case-insensitive)
             if status and stmt.get('status', '').lower() != status.lower():
@@ -57,7 +78,7 @@ class ListCardStatements(Function):
 
             results.append(stmt)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'card_statements'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -92,7 +113,9 @@ class ListCardStatements(Function):
                         "total_due_max": {
                             "type": "integer",
                             "description": "Maximum total due amount (inclusive)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
@@ -1,6 +1,10 @@
-import json
-from typing import Any, Dict, Optional
+from itertools import islice
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
+from ..data import CONTAINS, EQ, RANGE, TIME_RANGE, candidate_keys, filter_rows, temporal_column, to_micros
 from datetime import datetime
 
 
@@ -16,10 +20,21 @@ class ListCardTransactions(Function):
         occurred_from: Optional[str] = None,
         occurred_to: Optional[str] = None,
         merchant: Optional[str] = None,
-        card_tx_status: Optional[str] = None
+        card_tx_status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('transactions', fields, data.get('transactions', {}))
+        if isinstance(projection, str):
+            return projection
+
         transactions = data.get('transactions', {})
-        results = []
 
         merchant_lower = merchant.lower() if merchant else None
 
@@ -37,55 +52,75 @@ class ListCardTransactions(Function):
             except ValueError:
                 return "Error: 'occurred_to' must be an ISO datetime string"
 
-        def parse_date(t: Dict[str, Any]) -> datetime:
-            occ = t.get('occurred_at')
-            if isinstance(occ, str):
-                try:
-                    return datetime.fromisoformat(occ)
-                except ValueError:
-                    pass
-            if isinstance(occ, datetime):
-                return occ
-            return datetime.min
-
-        for txn in transactions.values():
+        # Pre-parsed occurred_at; unparseable values sort as datetime.min
+        occurred = temporal_column(data, 'transactions', 'occurred_at')
+        occ_from = to_micros(occ_from_dt) if occ_from_dt else None
+        occ_to = to_micros(occ_to_dt) if occ_to_dt else None
+        occ_min = to_micros(datetime.min)
+
+        def matches(key: str, txn: Dict[str, Any]) -> bool:
             # Filter by card_id (exact)
             if card_id is not None and txn.get('card_id') != card_id:
-                continue
+                return False
 
             # Filter by type (exact)
             if type and txn.get('type') != type:
-                continue
+                return False
 
             # Filter by channel (exact)
             if channel and txn.get('channel') != channel:
-                continue
+                return False
 
             # Filter by amount range
             amt = txn.get('amount')
             if amount_min is not None and amt < amount_min:
-                continue
+                return False
             if amount_max is not None and amt > amount_max:
-                continue
+                return False
 
             # Filter by occurred_at range
-            occ_dt = parse_date(txn)
-            if occ_from_dt and occ_dt < occ_from_dt:
-                continue
-            if occ_to_dt and occ_dt > occ_to_dt:
-                continue
+            if occ_from is not None or occ_to is not None:
+                occ = occurred.get(key)
+                if occ is None:
+                    occ = occ_min
+                if occ_from is not None and occ < occ_from:
+                    return False
+                if occ_to is not None and occ > occ_to:
+                    return False
 
             # Partial, case-insensitive match on merchant
             if merchant_lower and merchant_lower not in (txn.get('merchant') or '').lower():
-                continue
+                return False
 
             # Filter by card_tx_status (exact)
             if card_tx_status and txn.get('card_tx_status') != card_tx_status:
-                continue
+                return False
+
+            return True
 
-            results.append(txn)
+        # Column arrays (columnar store): evaluate every filter as a boolean mask
+        predicates = []
+        if amount_min is not None or amount_max is not None:
+            predicates.append((RANGE, 'amount', amount_min, amount_max))
+        if card_id is not None:
+            predicates.append((EQ, 'card_id', card_id))
+        for field, value in (('type', type), ('channel', channel), ('card_tx_status', card_tx_status)):
+            if value:
+                predicates.append((EQ, field, value))
+        if occ_from is not None or occ_to is not None:
+            predicates.append((TIME_RANGE, 'occurred_at', occ_from, occ_to, occ_min))
+        if merchant_lower:
+            predicates.append((CONTAINS, 'merchant', merchant_lower))
+        rows = filter_rows(transactions, predicates, matches, stop=page.stop)
+        if rows is not None:
+            return page.dumps(rows, projection, row_fragments(data, 'transactions'))
 
-        return json.dumps(results)
+        txn_keys = candidate_keys(data, 'transactions', {'card_id': card_id}, contains={'merchant': merchant_lower})
+        candidates = transactions.items() if txn_keys is None else ((k, transactions[k]) for k in txn_keys)
+        # A page without order_by only needs the first page.stop matches
+        results = list(islice((txn for key, txn in candidates if matches(key, txn)), page.stop))
+
+        return page.dumps(results, projection, row_fragments(data, 'transactions'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -134,7 +169,9 @@ class ListCardTransactions(Function):
                         "card_tx_status": {
                             "type": "string",
                             "description": "Card transaction status (exact match: UNBILLED, BILLED)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
@@ -1,6 +1,8 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -14,8 +16,20 @@ class ListCustomerAccounts(Function):
         account_type: Optional[str] = None,
         status: Optional[str] = None,
         balance_min: Optional[int] = None,
-        balance_max: Optional[int] = None
+        balance_max: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('accounts', fields, data.get('accounts', {}))
+        if isinstance(projection, str):
+            return projection
+
         accounts = data.get('accounts', {})
         results = []
 
@@ -62,7 +76,7 @@ class ListCustomerAccounts(Function):
 
             results.append(acc)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'accounts'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -101,7 +115,9 @@ class ListCustomerAccounts(Function):
                         "balance_max": {
                             "type": "integer",
                             "description": "Maximum account balance (inclusive, integer)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
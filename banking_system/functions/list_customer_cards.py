@@ -1,6 +1,8 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -15,8 +17,20 @@ class ListCustomerCards(Function):
         balance_min: Optional[int] = None,
         balance_max: Optional[int] = None,
         credit_limit_min: Optional[int] = None,
-        credit_limit_max: Optional[int] = None
+        credit_limit_max: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('cards', fields, data.get('cards', {}))
+        if isinstance(projection, str):
+            return projection
+
         cards = data.get('cards', {})
         results = []
 
@@ -57,7 +71,7 @@ class ListCustomerCards(Function):
 
             results.append(card)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'cards'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -100,7 +114,9 @@ class ListCustomerCards(Function):
                         "credit_limit_max": {
                             "type": "integer",
                             "description": "Maximum credit limit (inclusive)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
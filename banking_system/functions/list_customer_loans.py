@@ -1,6 +1,8 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -16,8 +18,20 @@ class ListCustomerLoans(Function):
         principal_min: Optional[int] = None,
         principal_max: Optional[int] = None,
         interest_min: Optional[int] = None,
-        interest_max: Optional[int] = None
+        interest_max: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('loans', fields, data.get('loans', {}))
+        if isinstance(projection, str):
+            return projection
+
         loans = data.get('loans', {})
         results = []
 
@@ -62,7 +76,7 @@ class ListCustomerLoans(Function):
 
             results.append(ln)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'loans'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -109,7 +123,9 @@ class ListCustomerLoans(Function):
                         "interest_max": {
                             "type": "integer",
                             "description": "Maximum interest rate (inclusive, in basis points or percent units)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
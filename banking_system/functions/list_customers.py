@@ -1,6 +1,9 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..data import candidate_keys
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -13,8 +16,20 @@ class ListCustomers(Function):
         last_name: Optional[str] = None,
         email: Optional[str] = None,
         phone: Optional[str] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('customers', fields, data.get('customers', {}))
+        if isinstance(projection, str):
+            return projection
+
         customers = data.get('customers', {})
         results = []
 
@@ -23,7 +38,13 @@ class ListCustomers(Function):
         last_lower = last_name.lower() if last_name else None
         email_lower = email.lower() if email else None
 
-        for cid, cust in customers.items():
+        # Only visit rows matching the most selective filter (email, phone, status, names)
+        cust_keys = candidate_keys(data, 'customers', {'phone': phone or None, 'status': status or None},
+                                   folded={'email': email_lower},
+                                   contains={'first_name': first_lower, 'last_name': last_lower})
+        candidates = customers.items() if cust_keys is None else ((k, customers[k]) for k in cust_keys)
+
+        for cid, cust in candidates:
             # Filter by customer_id (exact)
             if customer_id is not None:
                 try:
@@ -54,7 +75,7 @@ class ListCustomers(Function):
 
             results.append(cust)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'customers'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -89,7 +110,9 @@ class ListCustomers(Function):
                         "status": {
                             "type": "string",
                             "description": "Customer status (exact match, e.g., ACTIVE, INACTIVE)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
@@ -1,6 +1,9 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..data import candidate_keys
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -15,8 +18,20 @@ class ListEmployees(Function):
         role: Optional[str] = None,
         email: Optional[str] = None,
         phone: Optional[str] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('employees', fields, data.get('employees', {}))
+        if isinstance(projection, str):
+            return projection
+
         employees = data.get('employees', {})
         results = []
 
@@ -25,7 +40,16 @@ class ListEmployees(Function):
         last_lower = last_name.lower() if last_name else None
         email_lower = email.lower() if email else None
 
-        for eid, emp in employees.items():
+        # Only visit rows matching the most selective filter (email, phone, role, names, ...)
+        emp_keys = candidate_keys(data, 'employees', {
+            'branch_id': branch_id,
+            'role': role or None,
+            'phone': phone or None,
+            'status': status or None
+        }, folded={'email': email_lower}, contains={'first_name': first_lower, 'last_name': last_lower})
+        candidates = employees.items() if emp_keys is None else ((k, employees[k]) for k in emp_keys)
+
+        for eid, emp in candidates:
             # Filter by employee_id (exact)
             if employee_id is not None:
                 try:
@@ -64,7 +88,7 @@ class ListEmployees(Function):
 
             results.append(emp)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'employees'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -107,7 +131,9 @@ class ListEmployees(Function):
                         "status": {
                             "type": "string",
                             "description": "Employment status (exact match: ACTIVE, INACTIVE, ON_LEAVE)"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
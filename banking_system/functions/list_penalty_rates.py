@@ -1,6 +1,9 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from src.classes.function import Function
+from ..data import penalty_rate_keys
+from ..encoding import row_fragments
+from ..pagination import PAGINATION_PROPERTIES, Page
+from ..projection import PROJECTION_PROPERTIES, Projection
 from datetime import datetime
 
 
@@ -10,9 +13,24 @@ class ListPenaltyRates(Function):
         data: Dict[str, Any],
         product_type: Optional[str] = None,
         product_subtype: Optional[str] = None,
-        overdue_days: Optional[int] = None
+        overdue_days: Optional[int] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None,
+        fields: Optional[List[str]] = None
     ) -> str:
+        page = Page.parse(limit, offset, cursor, order_by)
+        if isinstance(page, str):
+            return page
+        projection = Projection.parse('penalty_rates', fields, data.get('penalty_rates', {}))
+        if isinstance(projection, str):
+            return projection
+
         penalty_rates = data.get('penalty_rates', {})
+        keys = penalty_rate_keys(data, product_type, product_subtype, overdue_days)
+        if keys is not None:
+            return page.dumps([penalty_rates[k] for k in keys], projection, row_fragments(data, 'penalty_rates'))
         results = []
 
         for pr_id, rate in penalty_rates.items():
@@ -35,7 +53,7 @@ class ListPenaltyRates(Function):
 
             results.append(rate)
 
-        return json.dumps(results)
+        return page.dumps(results, projection, row_fragments(data, 'penalty_rates'))
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
@@ -58,7 +76,9 @@ class ListPenaltyRates(Function):
                         "overdue_days": {
                             "type": "integer",
                             "description": "Number of days overdue; if provided, returns only rates where this value falls between days_overdue_from and days_overdue_to"
-                        }
+                        },
+                        **PAGINATION_PROPERTIES,
+                        **PROJECTION_PROPERTIES
                     },
                     "required": []
                 }
@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict, Optional
 from src.classes.function import Function
+from ..data import insert_row, next_id, update_row
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -14,7 +15,6 @@ class MakeCardPurchase(Function):
         channel: Optional[str] = 'POS'
     ) -> str:
         cards = data.get('cards', {})
-        transactions = data.get('transactions', {})
         accounts = data.get('accounts', {})
 
         # Validate card_id and fetch card directly by key
@@ -49,16 +49,20 @@ class MakeCardPurchase(Function):
             credit_limit = float(card.get('credit_limit', 0))
             if credit_limit - amount < 0:
                 return "Error: Credit limit exceeded"
-            card['credit_limit'] = round(credit_limit - amount, 2)
-            card['updated_at'] = now_iso
+            card = update_row(data, 'cards', key, {
+                'credit_limit': round(credit_limit - amount, 2),
+                'updated_at': now_iso
+            })
 
         # PREPAID card: deduct from the card's own balance
         elif ctype == 'PREPAID':
             current_balance = float(card.get('balance', 0))
             if amount > current_balance:
                 return "Error: Insufficient prepaid card balance"
-            card['balance'] = round(current_balance - amount, 2)
-            card['updated_at'] = now_iso
+            card = update_row(data, 'cards', key, {
+                'balance': round(current_balance - amount, 2),
+                'updated_at': now_iso
+            })
 
         # DEBIT card: deduct from the linked bank account
         elif ctype == 'DEBIT':
@@ -69,15 +73,16 @@ class MakeCardPurchase(Function):
             acct_balance = float(account.get('balance', 0))
             if amount > acct_balance:
                 return "Error: Insufficient funds in linked account"
-            account['balance'] = round(acct_balance - amount, 2)
-            account['updated_at'] = now_iso
+            update_row(data, 'accounts', linked_account_key, {
+                'balance': round(acct_balance - amount, 2),
+                'updated_at': now_iso
+            })
 
         else:
             return f"Error: Unsupported card type '{ctype}'"
 
         # Generate new transaction_id
-        existing_ids = [int(tid) for tid in transactions.keys() if tid.isdigit()]
-        new_txn_id = str(max(existing_ids) + 1) if existing_ids else "1"
+        new_txn_id = str(next_id(data, 'transactions'))
 
         # Create transaction record
         txn = {
@@ -93,9 +98,9 @@ class MakeCardPurchase(Function):
             "card_tx_status": "UNBILLED",
             "created_at": now_iso
         }
-        transactions[new_txn_id] = txn
+        insert_row(data, 'transactions', new_txn_id, txn)
 
-        return json.dumps({
+        return dumps({
             "message": "Card purchase recorded",
             "transaction": txn
         }, default=str)
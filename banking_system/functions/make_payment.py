@@ -1,6 +1,8 @@
-import json
 from typing import Any, Dict
 from src.classes.function import Function
+from ..data import (candidate_keys, find_row, insert_row, next_id, payments_since, recent_keys,
+                    temporal_column, to_micros, update_row)
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -16,8 +18,6 @@ class MakePayment(Function):
     ) -> str:
         accounts = data.get('accounts', {})
         beneficiaries = data.get('beneficiaries', {})
-        loans = data.get('loans', {})
-        cards = data.get('cards', {})
         transactions = data.get('transactions', {})
         loan_statements = data.get('loan_statements', {})
         card_statements = data.get('card_statements', {})
@@ -61,21 +61,68 @@ class MakePayment(Function):
 
         # Deduct from source account
         now_iso = datetime.now().isoformat()
-        account['balance'] = round(current_balance - amount_val, 2)
-        account['updated_at'] = now_iso
+        update_row(data, 'accounts', acct_key, {
+            'balance': round(current_balance - amount_val, 2),
+            'updated_at': now_iso
+        })
 
         card_id = None  # will set if CARD
 
-        # Helper: parse datetime from transactions
-        def _parse_dt(val: Any) -> datetime:
-            if isinstance(val, datetime):
-                return val
-            if isinstance(val, str):
-                try:
-                    return datetime.fromisoformat(val)
-                except ValueError:
-                    return datetime.min
-            return datetime.min
+        # Helper: prior (key, transaction) pairs for this beneficiary (indexed when available)
+        def beneficiary_txns():
+            txn_keys = candidate_keys(data, 'transactions', {'beneficiary_id': beneficiary_id})
+            if txn_keys is None:
+                return transactions.items()
+            return [(k, transactions[k]) for k in txn_keys]
+
+        # Helper: pre-parsed occurred_at of a transaction; unparseable values count as datetime.min
+        occurred = temporal_column(data, 'transactions', 'occurred_at')
+        occ_min = to_micros(datetime.min)
+
+        def _occurred_at(key: str) -> int:
+            occ = occurred.get(key)
+            return occ_min if occ is None else occ
+
+        # Helper: total of this beneficiary's earlier payments since a period start
+        def paid_since(period_start) -> float:
+            start = to_micros(datetime.combine(period_start, datetime.min.time()))
+            total_paid = payments_since(data, beneficiary_id, start)
+            if total_paid is not None:
+                return total_paid
+            total_paid = 0.0
+            for tx_key, tx in beneficiary_txns():
+                if tx.get('type') == 'PAYMENT' and tx.get('beneficiary_id') == beneficiary_id:
+                    if _occurred_at(tx_key) >= start:
+                        try:
+                            total_paid += float(tx.get('amount', 0))
+                        except (TypeError, ValueError):
+                            continue
+            return total_paid
+
+        # Helper: (key, period_start) of the statement with the latest period_end
+        # (the first such in table order), or None
+        def _period_dates(stmt):
+            try:
+                pe = datetime.fromisoformat(stmt.get('period_end')).date() if isinstance(stmt.get('period_end'), str) else stmt.get('period_end')
+                ps = datetime.fromisoformat(stmt.get('period_start')).date() if isinstance(stmt.get('period_start'), str) else stmt.get('period_start')
+            except Exception:
+                pe, ps = None, None
+            return pe, ps
+
+        def latest_statement(table: str, owner_field: str, owner_id):
+            statements = data.get(table, {})
+            newest = recent_keys(data, table, owner_field, owner_id, 'period_end', 1)
+            if newest:
+                pe, ps = _period_dates(statements[newest[0]])
+                if pe:
+                    return newest[0], ps
+            latest = None
+            for sid, stmt in statements.items():
+                if stmt.get(owner_field) == owner_id:
+                    pe, ps = _period_dates(stmt)
+                    if pe and (latest is None or pe > latest[1]):
+                        latest = (sid, pe, ps)
+            return None if latest is None else (latest[0], latest[2])
 
         # ---------- LOAN payments ----------
         if pt == "LOAN":
@@ -84,45 +131,21 @@ class MakePayment(Function):
 
             loan_acct_num = ben.get('account_number')
             # find loan by loan_account_number
-            loan_obj = next((ln for ln in loans.values()
-                             if ln.get('loan_account_number') == loan_acct_num), None)
+            found = find_row(data, 'loans', 'loan_account_number', loan_acct_num)
+            loan_obj = found[1] if found else None
             if not loan_obj:
                 return f"Error: No loan found for beneficiary account '{loan_acct_num}'"
 
-            # Find latest statement (by period_end) for this loan
-            latest_stmt_key = None
-            latest_period_end = None
-            latest_period_start = None
-            for sid, stmt in loan_statements.items():
-                if stmt.get('loan_id') == loan_obj.get('loan_id'):
-                    try:
-                        pe = datetime.fromisoformat(stmt.get('period_end')).date() if isinstance(stmt.get('period_end'), str) else stmt.get('period_end')
-                        ps = datetime.fromisoformat(stmt.get('period_start')).date() if isinstance(stmt.get('period_start'), str) else stmt.get('period_start')
-                    except Exception:
-                        pe, ps = None, None
-                    if pe and (latest_period_end is None or pe > latest_period_end):
-                        latest_period_end = pe
-                        latest_period_start = ps
-                        latest_stmt_key = sid
-
-            # If there is a latest statement and it's not PAID, sum payments from that period_start onward
-            if latest_stmt_key is not None:
+            # Close out the latest statement once this payment covers it
+            latest = latest_statement('loan_statements', 'loan_id', loan_obj.get('loan_id'))
+            if latest is not None:
+                latest_stmt_key, latest_period_start = latest
                 stmt = loan_statements[latest_stmt_key]
                 if stmt.get('status') != 'PAID' and latest_period_start is not None:
-                    start_dt = datetime.combine(latest_period_start, datetime.min.time())
-                    total_paid = 0.0
-                    for tx in transactions.values():
-                        if tx.get('type') == 'PAYMENT' and tx.get('beneficiary_id') == beneficiary_id:
-                            occ = _parse_dt(tx.get('occurred_at'))
-                            if occ >= start_dt:
-                                try:
-                                    total_paid += float(tx.get('amount', 0))
-                                except (TypeError, ValueError):
-                                    continue
-                    total_paid += amount_val  # include this payment
+                    total_paid = paid_since(latest_period_start) + amount_val  # include this payment
                     scheduled = float(stmt.get('scheduled_amount', 0))
                     if total_paid >= scheduled:
-                        stmt['status'] = 'PAID'
+                        update_row(data, 'loan_statements', latest_stmt_key, {'status': 'PAID'})
 
         # ---------- CARD payments ----------
         else:
@@ -131,13 +154,7 @@ class MakePayment(Function):
             card_num = ben.get('account_number')
 
             # locate card by card_number
-            found_key = None
-            card = None
-            for k, c in cards.items():
-                if c.get('card_number') == card_num:
-                    found_key = k
-                    card = c
-                    break
+            found_key, card = find_row(data, 'cards', 'card_number', card_num) or (None, None)
             if found_key is None or not card:
                 return f"Error: No card found for beneficiary account '{card_num}'"
 
@@ -145,49 +162,29 @@ class MakePayment(Function):
             if ctype == 'CREDIT':
                 # Credit payment increases available limit (reduces outstanding)
                 new_limit = float(card.get('credit_limit', 0)) + amount_val
-                card['credit_limit'] = round(new_limit, 2)
-                card['updated_at'] = now_iso
-
-                # Find latest statement (by period_end) for this card
-                latest_stmt_key = None
-                latest_period_end = None
-                latest_period_start = None
-                for sid, stmt in card_statements.items():
-                    if stmt.get('card_id') == card.get('card_id'):
-                        try:
-                            pe = datetime.fromisoformat(stmt.get('period_end')).date() if isinstance(stmt.get('period_end'), str) else stmt.get('period_end')
-                            ps = datetime.fromisoformat(stmt.get('period_start')).date() if isinstance(stmt.get('period_start'), str) else stmt.get('period_start')
-                        except Exception:
-                            pe, ps = None, None
-                        if pe and (latest_period_end is None or pe > latest_period_end):
-                            latest_period_end = pe
-                            latest_period_start = ps
-                            latest_stmt_key = sid
-
-                # If there is a latest statement and it's not PAID, sum payments from that period_start onward
-                if latest_stmt_key is not None:
+                card = update_row(data, 'cards', found_key, {
+                    'credit_limit': round(new_limit, 2),
+                    'updated_at': now_iso
+                })
+
+                # Close out the latest statement once this payment covers it
+                latest = latest_statement('card_statements', 'card_id', card.get('card_id'))
+                if latest is not None:
+                    latest_stmt_key, latest_period_start = latest
                     stmt = card_statements[latest_stmt_key]
                     if stmt.get('status') != 'PAID' and latest_period_start is not None:
-                        start_dt = datetime.combine(latest_period_start, datetime.min.time())
-                        total_paid = 0.0
-                        for tx in transactions.values():
-                            if tx.get('type') == 'PAYMENT' and tx.get('beneficiary_id') == beneficiary_id:
-                                occ = _parse_dt(tx.get('occurred_at'))
-                                if occ >= start_dt:
-                                    try:
-                                        total_paid += float(tx.get('amount', 0))
-                                    except (TypeError, ValueError):
-                                        continue
-                        total_paid += amount_val  # include this payment
+                        total_paid = paid_since(latest_period_start) + amount_val  # include this payment
                         total_due = float(stmt.get('total_due', 0))
                         if total_paid >= total_due:
-                            stmt['status'] = 'PAID'
+                            update_row(data, 'card_statements', latest_stmt_key, {'status': 'PAID'})
 
             elif ctype == 'PREPAID':
                 # Prepaid payment increases stored balance
                 new_bal = float(card.get('balance', 0)) + amount_val
-                card['balance'] = round(new_bal, 2)
-                card['updated_at'] = now_iso
+                card = update_row(data, 'cards', found_key, {
+                    'balance': round(new_bal, 2),
+                    'updated_at': now_iso
+                })
                 # No statements logic for prepaid
             else:
                 return f"Error: Cannot make payment to a {ctype} card"
@@ -195,8 +192,7 @@ class MakePayment(Function):
             card_id = int(found_key)
 
         # Generate new transaction_id
-        existing_ids = [int(tid) for tid in transactions.keys() if tid.isdigit()]
-        new_txn_id = str(max(existing_ids) + 1) if existing_ids else "1"
+        new_txn_id = str(next_id(data, 'transactions'))
 
         txn = {
             "transaction_id": int(new_txn_id),
@@ -211,10 +207,10 @@ class MakePayment(Function):
             "card_tx_status": None,
             "created_at": now_iso
         }
-        transactions[new_txn_id] = txn
+        insert_row(data, 'transactions', new_txn_id, txn)
 
         message = "Loan payment successful" if pt == "LOAN" else "Card payment successful"
-        return json.dumps({
+        return dumps({
             "message": message,
             "transaction": txn
         }, default=str)
@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict, Optional
 from src.classes.function import Function
+from ..data import find_row, insert_row, next_id, update_row
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -15,7 +16,6 @@ class TransferToOtherBankAccount(Function):
     ) -> str:
         accounts = data.get('accounts', {})
         beneficiaries = data.get('beneficiaries', {})
-        transactions = data.get('transactions', {})
 
         # Validate from_account_id and fetch source account by key
         if not isinstance(from_account_id, int):
@@ -57,27 +57,28 @@ class TransferToOtherBankAccount(Function):
 
         # Deduct from source account
         now_iso = datetime.now().isoformat()
-        source_account['balance'] = round(current_balance - amt, 2)
-        source_account['updated_at'] = now_iso
+        update_row(data, 'accounts', src_key, {
+            'balance': round(current_balance - amt, 2),
+            'updated_at': now_iso
+        })
 
         # If the destination (other bank) account exists in our DB by account_number, credit it
         dest_acct_number = ben.get('account_number')
         dest_account = None
         dest_key = None
         if dest_acct_number:
-            for k, acc in accounts.items():
-                if acc.get('account_number') == dest_acct_number:
-                    dest_account = acc
-                    dest_key = k
-                    break
+            found = find_row(data, 'accounts', 'account_number', dest_acct_number)
+            if found:
+                dest_key, dest_account = found
         if dest_account:
             dest_balance = float(dest_account.get('balance', 0))
-            dest_account['balance'] = round(dest_balance + amt, 2)
-            dest_account['updated_at'] = now_iso
+            update_row(data, 'accounts', dest_key, {
+                'balance': round(dest_balance + amt, 2),
+                'updated_at': now_iso
+            })
 
         # Generate new transaction_id
-        existing_ids = [int(tid) for tid in transactions.keys() if tid.isdigit()]
-        new_txn_id = str(max(existing_ids) + 1) if existing_ids else "1"
+        new_txn_id = str(next_id(data, 'transactions'))
 
         # Create transaction record (source-side)
         txn = {
@@ -93,9 +94,9 @@ class TransferToOtherBankAccount(Function):
             "card_tx_status": None,
             "created_at": now_iso
         }
-        transactions[new_txn_id] = txn
+        insert_row(data, 'transactions', new_txn_id, txn)
 
-        return json.dumps({
+        return dumps({
             "message": "Transfer to other bank account successful",
             "transaction": txn
         }, default=str)
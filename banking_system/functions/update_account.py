@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict, Optional
 from src.classes.function import Function
+from ..data import update_row
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -40,27 +41,27 @@ class UpdateAccount(Function):
         if branch_id is not None:
             if not isinstance(branch_id, int):
                 return "Error: 'branch_id' must be an integer"
-            account['branch_id'] = branch_id
+            account = update_row(data, 'accounts', account_key, {'branch_id': branch_id})
 
         if customer_id is not None:
             if not isinstance(customer_id, int):
                 return "Error: 'customer_id' must be an integer"
-            account['customer_id'] = customer_id
+            account = update_row(data, 'accounts', account_key, {'customer_id': customer_id})
 
         if account_type is not None:
             if not isinstance(account_type, str):
                 return "Error: 'account_type' must be a string"
-            account['type'] = account_type
+            account = update_row(data, 'accounts', account_key, {'type': account_type})
 
         if status is not None:
             if not isinstance(status, str):
                 return "Error: 'status' must be a string"
-            account['status'] = status
+            account = update_row(data, 'accounts', account_key, {'status': status})
 
         # Update timestamp
-        account['updated_at'] = datetime.now().isoformat()
+        account = update_row(data, 'accounts', account_key, {'updated_at': datetime.now().isoformat()})
 
-        return json.dumps(account, default=str)
+        return dumps(account, default=str)
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
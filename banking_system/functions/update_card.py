@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict, Optional
 from src.classes.function import Function
+from ..data import update_row
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -36,7 +37,7 @@ class UpdateCard(Function):
         if credit_limit is not None:
             if not isinstance(credit_limit, int) or credit_limit < 0:
                 return "Error: 'credit_limit' must be a non-negative integer"
-            card['credit_limit'] = credit_limit
+            card = update_row(data, 'cards', card_key, {'credit_limit': credit_limit})
 
         # Update status if provided
         if status is not None:
@@ -45,7 +46,7 @@ class UpdateCard(Function):
             valid_statuses = {"ACTIVE", "BLOCKED", "EXPIRED"}
             if status not in valid_statuses:
                 return f"Error: 'status' must be one of: {', '.join(valid_statuses)}"
-            card['status'] = status
+            card = update_row(data, 'cards', card_key, {'status': status})
 
         # Update expiry_date if provided
         if expiry_date is not None:
@@ -53,14 +54,14 @@ class UpdateCard(Function):
                 return "Error: 'expiry_date' must be a string in YYYY-MM-DD format"
             try:
                 exp = datetime.fromisoformat(expiry_date).date()
-                card['expiry_date'] = exp.isoformat()
+                card = update_row(data, 'cards', card_key, {'expiry_date': exp.isoformat()})
             except Exception:
                 return "Error: 'expiry_date' must be a string in YYYY-MM-DD format"
 
         # Update timestamp
-        card['updated_at'] = datetime.now().isoformat()
+        card = update_row(data, 'cards', card_key, {'updated_at': datetime.now().isoformat()})
 
-        return json.dumps(card, default=str)
+        return dumps(card, default=str)
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
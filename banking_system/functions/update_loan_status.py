@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict
 from src.classes.function import Function
+from ..data import update_row
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -37,14 +38,13 @@ class UpdateLoanStatus(Function):
             return f"Error: 'status' must be one of: {', '.join(valid_statuses)}"
 
         # Update loan status
-        loan = loans[loan_key]
-        loan['status'] = status
+        loan = update_row(data, 'loans', loan_key, {'status': status})
 
         # Optionally set end_date when closing
         if status == "CLOSED":
-            loan['end_date'] = datetime.now().date().isoformat()
+            loan = update_row(data, 'loans', loan_key, {'end_date': datetime.now().date().isoformat()})
 
-        return json.dumps(loan, default=str)
+        return dumps(loan, default=str)
 
     @staticmethod
     def get_metadata() -> Dict[str, Any]:
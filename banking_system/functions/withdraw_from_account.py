@@ -1,6 +1,7 @@
-import json
 from typing import Any, Dict
 from src.classes.function import Function
+from ..data import insert_row, next_id, update_row
+from ..encoding import dumps
 from datetime import datetime
 
 
@@ -13,7 +14,6 @@ class WithdrawFromAccount(Function):
         channel: str
     ) -> str:
         accounts = data.get('accounts', {})
-        transactions = data.get('transactions', {})
 
         # Validate account_id and fetch account directly by key
         if not isinstance(account_id, int):
@@ -44,12 +44,13 @@ class WithdrawFromAccount(Function):
 
         # Update account balance (store as float with 2 decimals)
         new_balance = round(current_balance - amount_val, 2)
-        account['balance'] = new_balance
-        account['updated_at'] = datetime.now().isoformat()
+        update_row(data, 'accounts', acct_key, {
+            'balance': new_balance,
+            'updated_at': datetime.now().isoformat()
+        })
 
         # Generate new transaction_id
-        existing_ids = [int(tid) for tid in transactions.keys() if tid.isdigit()]
-        new_txn_id = str(max(existing_ids) + 1) if existing_ids else "1"
+        new_txn_id = str(next_id(data, 'transactions'))
 
         now = datetime.now().isoformat()
 
@@ -67,9 +68,9 @@ class WithdrawFromAccount(Function):
             "card_tx_status": None,
             "created_at": now
         }
-        transactions[new_txn_id] = txn
+        insert_row(data, 'transactions', new_txn_id, txn)
 
-        return json.dumps({
+        return dumps({
             "message": "Withdrawal successful",
             "transaction": txn
         }, default=str)
@@ -0,0 +1,167 @@
+import json
+import heapq
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Union
+
+from .data import RowFragments
+from .encoding import dumps, dumps_object, dumps_rows
+from .projection import Projection
+
+# Parameters shared by every list_* function; merged into their metadata
+PAGINATION_PROPERTIES = {
+    "limit": {
+        "type": "integer",
+        "description": "Maximum number of results to return. When set, the response is "
+                       "{\"results\": [...], \"next_cursor\": ...}; next_cursor is null on the last page"
+    },
+    "offset": {
+        "type": "integer",
+        "description": "Number of matching results to skip (default 0)"
+    },
+    "cursor": {
+        "type": "string",
+        "description": "next_cursor of a previous page, to fetch the page after it"
+    },
+    "order_by": {
+        "type": "string",
+        "description": "Field to sort results by (ascending; prefix with '-' for descending). "
+                       "Results missing the field come last"
+    }
+}
+
+
+def _encode_cursor(offset: int, order_by: Optional[str]) -> str:
+    raw = json.dumps({"offset": offset, "order_by": order_by}).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if not isinstance(state, dict) or not isinstance(state.get("offset"), int) or state["offset"] < 0:
+        return None
+    return state
+
+
+def _sort_key(field: str, descending: bool):
+    # Rows without the field sort last in both directions
+    if descending:
+        return lambda row: (1, row.get(field)) if row.get(field) is not None else (0, 0)
+    return lambda row: (0, row.get(field)) if row.get(field) is not None else (1, 0)
+
+
+class Page:
+    """
+    Validated limit/offset/cursor/order_by arguments of one list_* call.
+    Build it with Page.parse() before filtering, then shape the matches
+    with apply(). With every argument left as None, apply() returns the
+    results unchanged, so the response is the plain list as before.
+    """
+
+    def __init__(self, limit: Optional[int], offset: int, order_by: Optional[str], paged: bool):
+        self.limit = limit
+        self.offset = offset
+        self.order_by = order_by
+        self.paged = paged
+
+    @classmethod
+    def parse(
+        cls,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        order_by: Optional[str] = None
+    ) -> Union["Page", str]:
+        """Return a Page, or an error string for invalid arguments."""
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except (ValueError, TypeError):
+                return "Error: 'limit' must be a positive integer"
+            if limit <= 0:
+                return "Error: 'limit' must be a positive integer"
+
+        start = 0
+        if offset is not None:
+            try:
+                start = int(offset)
+            except (ValueError, TypeError):
+                return "Error: 'offset' must be a non-negative integer"
+            if start < 0:
+                return "Error: 'offset' must be a non-negative integer"
+
+        if order_by is not None and (not isinstance(order_by, str) or not order_by.lstrip('-')):
+            return "Error: 'order_by' must be a field name, optionally prefixed with '-'"
+
+        if cursor is not None:
+            state = _decode_cursor(cursor) if isinstance(cursor, str) else None
+            if state is None:
+                return "Error: 'cursor' is invalid"
+            if order_by is None:
+                order_by = state.get("order_by")
+            elif state.get("order_by") != order_by:
+                return "Error: 'cursor' was issued for a different 'order_by'"
+            # The cursor already accounts for earlier offsets
+            start = state["offset"]
+
+        return cls(limit, start, order_by, paged=limit is not None or cursor is not None)
+
+    @property
+    def stop(self) -> Optional[int]:
+        """
+        How many matches in table order the page needs (one extra tells
+        whether another page follows), or None when every match is needed.
+        Filters may stop scanning once they have this many.
+        """
+        if self.limit is None or self.order_by is not None:
+            return None
+        return self.offset + self.limit + 1
+
+    def dumps(self, results: List[Dict[str, Any]], projection: Optional["Projection"] = None,
+              fragments: Optional[RowFragments] = None) -> str:
+        """
+        JSON response for the matching results, or an error string. With a
+        projection, only the rows of the returned page are projected.
+        Unprojected rows are joined from their cached fragments, if given.
+        """
+        shaped = self.apply(results)
+        if isinstance(shaped, str):
+            return shaped
+        rows = shaped["results"] if self.paged else shaped
+        if projection is not None and projection.projector is not None:
+            rows = projection.rows(rows)
+            fragments = None
+        body = dumps_rows(rows, fragments)
+        if not self.paged:
+            return body
+        return dumps_object({"results": body, "next_cursor": dumps(shaped["next_cursor"])})
+
+    def apply(self, results: List[Dict[str, Any]]) -> Union[List[Dict[str, Any]], Dict[str, Any], str]:
+        """Order, slice and (when paged) wrap the matching results; error string if unsortable."""
+        if self.order_by is not None:
+            descending = self.order_by.startswith('-')
+            field = self.order_by.lstrip('-')
+            key = _sort_key(field, descending)
+            try:
+                if self.limit is not None:
+                    # Top-k: only the rows up to the end of this page (plus one) are ordered
+                    count = self.offset + self.limit + 1
+                    select = heapq.nlargest if descending else heapq.nsmallest
+                    results = select(count, results, key=key)
+                else:
+                    results = sorted(results, key=key, reverse=descending)
+            except TypeError:
+                return f"Error: Cannot order by '{field}': values are not comparable"
+
+        end = None if self.limit is None else self.offset + self.limit
+        rows = results[self.offset:end]
+        if not self.paged:
+            return rows
+        has_more = end is not None and len(results) > end
+        return {
+            "results": rows,
+            "next_cursor": _encode_cursor(end, self.order_by) if has_more else None
+        }
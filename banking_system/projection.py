@@ -0,0 +1,94 @@
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+
+from .data import ColumnarRows, OverlayTable
+from .filter_schema import filter_schema
+
+# Opt-in: drop the columns filter_schema marks as hidden (False) from responses
+HIDE_SCHEMA_FIELDS = os.environ.get("BANKING_SYSTEM_HIDE_SCHEMA_FIELDS", "") not in ("", "0")
+
+# Parameter shared by the list_*/get_* functions; merged into their metadata
+PROJECTION_PROPERTIES = {
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Only return these fields of each record (any visible field of the table)"
+    }
+}
+
+Projector = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+def hidden_fields(table: str) -> FrozenSet[str]:
+    return frozenset(field for field, visible in filter_schema.get(table, {}).get("*", {}).items() if not visible)
+
+
+def has_column(rows: Mapping[str, Dict[str, Any]], field: str) -> bool:
+    """Whether any row of a table has field; stops at the first that does."""
+    while isinstance(rows, OverlayTable):
+        if any(field in row for row in rows.rows.values()):
+            return True
+        rows = rows.base
+    if isinstance(rows, ColumnarRows):
+        return field in rows.columns
+    return any(field in row for row in rows.values())
+
+
+# Bounded: explicit fields tuples come from callers
+@lru_cache(maxsize=1024)
+def compile_projector(table: str, fields: Optional[Tuple[str, ...]] = None,
+                      hide_schema_fields: bool = False) -> Optional[Projector]:
+    """
+    Row -> projected row function for a table, compiled once per argument
+    set. fields keeps only those columns, in that order; otherwise, with
+    hide_schema_fields, the columns filter_schema hides are dropped. None
+    means rows are returned as they are.
+    """
+    if fields is not None:
+        return lambda row: {field: row[field] for field in fields if field in row}
+    hidden = hidden_fields(table) if hide_schema_fields else frozenset()
+    if not hidden:
+        return None
+    return lambda row: {field: value for field, value in row.items() if field not in hidden}
+
+
+class Projection:
+    """Validated fields argument of one call; rows() applies it to the response rows."""
+
+    def __init__(self, projector: Optional[Projector]):
+        self.projector = projector
+
+    @classmethod
+    def parse(cls, table: str, fields: Optional[Union[List[str], str]] = None,
+              rows: Optional[Mapping[str, Dict[str, Any]]] = None) -> Union["Projection", str]:
+        """
+        Return a Projection, or an error string for unknown or hidden
+        fields. Known fields are the schema's visible columns plus columns
+        the table's rows have but the schema does not list (cards.account_id,
+        ...); rows without a requested field simply omit it.
+        """
+        if fields is None:
+            return cls(compile_projector(table, None, HIDE_SCHEMA_FIELDS))
+        if isinstance(fields, str):
+            fields = [field.strip() for field in fields.split(',') if field.strip()]
+        if not isinstance(fields, (list, tuple)) or not fields or not all(isinstance(f, str) for f in fields):
+            return "Error: 'fields' must be a non-empty list of field names"
+        hidden = hidden_fields(table)
+        schema = filter_schema.get(table, {}).get("*", {})
+        unknown = [
+            field for field in fields
+            if field in hidden or (field not in schema and not has_column(rows or {}, field))
+        ]
+        if unknown:
+            return f"Error: Unknown field(s) for {table}: {', '.join(unknown)}"
+        return cls(compile_projector(table, tuple(dict.fromkeys(fields))))
+
+    def row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        return row if self.projector is None else self.projector(row)
+
+    def rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.projector is None:
+            return rows
+        projector = self.projector
+        return [projector(row) for row in rows]
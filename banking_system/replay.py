@@ -0,0 +1,197 @@
+"""
+Replay recorded action lists and check them against their recordings:
+every tasks/*.json action must reproduce its recorded "output", and every
+entries.py item must produce its "outputs" somewhere in its responses.
+Cases are sharded across a process pool; each worker loads the baseline
+once and resets one EpisodeData between cases.
+
+    python -m banking_system.replay tasks/*.json [--entries] [--workers N]
+"""
+import os
+import re
+import sys
+import json
+import glob
+import time
+import argparse
+from datetime import date
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+from .batch import BatchError, prepare_actions, run_prepared
+from .data import EpisodeData, load_json_files
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Worker state: one EpisodeData over the baseline, set up by _init_worker()
+_episode: Optional[EpisodeData] = None
+
+
+class Case:
+    """One action list to replay: a task file or an entries.py item."""
+
+    def __init__(self, case_id: str, actions: List[Dict[str, Any]], answers: Sequence[str] = ()):
+        self.case_id = case_id
+        self.actions = actions
+        # Strings an entry expects in its responses (entries' "outputs")
+        self.answers = list(answers)
+
+
+class CaseResult:
+    """Outcome of one replayed case; failures lists what did not match."""
+
+    def __init__(self, case_id: str, failures: List[str], seconds: float):
+        self.case_id = case_id
+        self.failures = failures
+        self.seconds = seconds
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+
+def load_task_cases(paths: Sequence[str]) -> List[Case]:
+    cases = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as file:
+            task = json.load(file)
+        name = os.path.splitext(os.path.basename(path))[0]
+        cases.append(Case(name, task.get("actions", [])))
+    return cases
+
+
+def load_entry_cases() -> List[Case]:
+    from .entries import entries
+    return [Case(entry.get("id", f"entry_{number}"), entry.get("actions", []), entry.get("outputs", ()))
+            for number, entry in enumerate(entries, start=1)]
+
+
+def _parse(output: str) -> Any:
+    try:
+        return json.loads(output)
+    except ValueError:
+        return output
+
+
+def _differences(expected: Any, actual: Any, today: str, path: str = "") -> List[str]:
+    """
+    Paths where actual differs from the recorded value. Values stamped with
+    the run date (created_at, opened_date, ...) are taken to come from
+    datetime.now() and match any recorded date.
+    """
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        found = []
+        for key in list(expected) + [key for key in actual if key not in expected]:
+            where = f"{path}.{key}" if path else key
+            if key not in actual:
+                found.append(f"{where}: missing")
+            elif key not in expected:
+                found.append(f"{where}: unexpected")
+            else:
+                found.extend(_differences(expected[key], actual[key], today, where))
+        return found
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path or '$'}: {len(actual)} items, recorded {len(expected)}"]
+        found = []
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            found.extend(_differences(left, right, today, f"{path}[{index}]"))
+        return found
+    if (isinstance(expected, str) and isinstance(actual, str) and actual.startswith(today)
+            and _ISO_DATE.match(expected)):
+        return []
+    # True == 1 in Python, but not in the recorded JSON
+    if expected == actual and isinstance(expected, bool) == isinstance(actual, bool):
+        return []
+    return [f"{path or '$'}: {actual!r}, recorded {expected!r}"]
+
+
+def _normalize_answer(text: str) -> str:
+    return text.lower().replace(",", "").replace("$", "")
+
+
+def _init_worker(cache: bool, columnar: bool) -> None:
+    global _episode
+    base = load_json_files(lazy=True, cache=cache, columnar=columnar).load_all()
+    _episode = EpisodeData(base)
+
+
+def replay_case(case: Case) -> CaseResult:
+    """Replay one case on the worker's episode, then reset it for the next."""
+    start = time.perf_counter()
+    today = date.today().isoformat()
+    failures: List[str] = []
+    try:
+        # Arguments go through as recorded, like the environment's dispatch:
+        # coercing bank_id="4" to 4 would hide a call that really returns []
+        prepared = prepare_actions(case.actions, coerce=False)
+        result = run_prepared(_episode, prepared)
+    except BatchError as e:
+        failures.extend(e.errors)
+    except Exception as e:
+        failures.append(f"raised {type(e).__name__}: {e}")
+    else:
+        for number, (action, step) in enumerate(zip(case.actions, result.steps), start=1):
+            if "output" not in action:
+                continue
+            for difference in _differences(action["output"], _parse(step.output), today):
+                failures.append(f"step {number} ({step.name}): {difference}")
+        if case.answers:
+            responses = _normalize_answer(" ".join(result.outputs))
+            failures.extend(f"answer {answer!r} not in any response" for answer in case.answers
+                            if _normalize_answer(answer) not in responses)
+    finally:
+        _episode.reset()
+    return CaseResult(case.case_id, failures, time.perf_counter() - start)
+
+
+def replay(cases: Sequence[Case], workers: Optional[int] = None, cache: bool = False,
+           columnar: bool = False) -> List[CaseResult]:
+    """
+    Replay cases across a pool of worker processes (os.cpu_count() by
+    default) and return their results in input order. workers=1 replays
+    in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(cases) <= 1:
+        _init_worker(cache, columnar)
+        return [replay_case(case) for case in cases]
+    # Contiguous shards amortize the pickling round trips over many cases
+    chunksize = max(1, len(cases) // (workers * 4))
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(cache, columnar)) as pool:
+        return list(pool.map(replay_case, cases, chunksize=chunksize))
+
+
+def format_report(results: Sequence[CaseResult], seconds: float) -> str:
+    lines = []
+    for result in results:
+        status = "PASS" if result.passed else "FAIL"
+        lines.append(f"{status} {result.case_id:<24} {result.seconds * 1000:9.1f} ms")
+        lines.extend(f"     {failure}" for failure in result.failures)
+    passed = sum(result.passed for result in results)
+    lines.append(f"{passed}/{len(results)} passed in {seconds:.2f} s")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("tasks", nargs="*", help="task JSON files (default: tasks/*.json)")
+    parser.add_argument("--entries", action="store_true", help="also replay the entries.py items")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--cache", action="store_true", help="load tables through the snapshot cache")
+    parser.add_argument("--columnar", action="store_true", help="keep transactions in column arrays")
+    args = parser.parse_args(argv)
+
+    paths = args.tasks or sorted(glob.glob("tasks/*.json"))
+    cases = load_task_cases(paths)
+    if args.entries:
+        cases += load_entry_cases()
+
+    start = time.perf_counter()
+    results = replay(cases, args.workers, args.cache, args.columnar)
+    print(format_report(results, time.perf_counter() - start))
+    return 0 if all(result.passed for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
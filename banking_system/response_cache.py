@@ -0,0 +1,128 @@
+import json
+import inspect
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+from .data import table_versions
+
+# Read-only functions and the tables their responses depend on
+READ_TABLES: Dict[str, Tuple[str, ...]] = {
+    "get_account_summary": ("accounts", "transactions"),
+    "get_bank_by_name": ("banks",),
+    "get_loan_amortization_schedule": ("loans",),
+    "list_account_transactions": ("transactions",),
+    "list_beneficiaries": ("beneficiaries",),
+    "list_branches": ("branches",),
+    "list_card_statements": ("card_statements",),
+    "list_card_transactions": ("transactions",),
+    "list_customer_accounts": ("accounts",),
+    "list_customer_cards": ("cards",),
+    "list_customer_loans": ("loans",),
+    "list_customers": ("customers",),
+    "list_employees": ("employees",),
+    "list_loan_statements": ("loan_statements",),
+    "list_penalty_rates": ("penalty_rates",),
+}
+
+
+class CachedFunction:
+    """Stands in for a read-only function class in FUNCTIONS_MAP; apply() goes through the cache."""
+
+    def __init__(self, cache: "ResponseCache", name: str, function: Any):
+        self.cache = cache
+        self.name = name
+        self.function = function
+
+    def apply(self, data: Mapping[str, Any], /, **kwargs) -> str:
+        return self.cache.call(self.name, data, **kwargs)
+
+    def get_metadata(self) -> Dict[str, Any]:
+        return self.function.get_metadata()
+
+
+class ResponseCache:
+    """
+    Bounded LRU of read-only function responses, keyed by (function,
+    normalized arguments, versions of the tables the function reads).
+    Any write to one of those tables gives it a new version, so stale
+    entries are never hit again and age out of the LRU.
+
+    Responses are only cached for data that tracks its writes (LazyTables,
+    EpisodeData); calls on plain dicts, or with arguments that do not bind
+    to the function's signature, go straight to the function.
+    """
+
+    def __init__(self, functions: Mapping[str, Any], maxsize: int = 1024,
+                 read_tables: Mapping[str, Tuple[str, ...]] = READ_TABLES):
+        self.functions = functions
+        self.maxsize = maxsize
+        self.read_tables = {name: tables for name, tables in read_tables.items() if name in functions}
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._signatures = {name: inspect.signature(functions[name].apply) for name in self.read_tables}
+
+    def _key(self, name: str, data: Mapping[str, Any], kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        versions = table_versions(data, self.read_tables[name])
+        if versions is None:
+            return None
+        try:
+            bound = self._signatures[name].bind(data, **kwargs)
+        except TypeError:
+            return None
+        bound.apply_defaults()
+        # Positional and keyword spellings of the same call share an entry
+        arguments = [value for param, value in bound.arguments.items() if param != "data"]
+        try:
+            normalized = json.dumps(arguments, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return name, normalized, versions
+
+    def call(self, function_name: str, data: Mapping[str, Any], /, **kwargs) -> str:
+        """
+        Response of FUNCTIONS_MAP[function_name].apply(data, **kwargs), served
+        from the cache when possible. The wrapper's own parameters are
+        positional-only, so functions taking a name (get_bank_by_name, ...)
+        pass it through as an ordinary keyword.
+        """
+        function = self.functions[function_name]
+        key = self._key(function_name, data, kwargs) if function_name in self.read_tables else None
+        if key is None:
+            self.uncached += 1
+            return function.apply(data, **kwargs)
+
+        entries = self._entries
+        response = entries.get(key)
+        if response is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return response
+
+        self.misses += 1
+        response = function.apply(data, **kwargs)
+        entries[key] = response
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return response
+
+    def wrap(self) -> Dict[str, Any]:
+        """Copy of the functions map with the read-only functions routed through the cache."""
+        return {
+            name: CachedFunction(self, name, function) if name in self.read_tables else function
+            for name, function in self.functions.items()
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.uncached = 0
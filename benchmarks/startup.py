@@ -0,0 +1,65 @@
+"""
+Startup benchmark: time importing banking_system and reading every data
+table from JSON versus from the binary snapshot cache, each in a fresh
+interpreter so nothing is shared between runs.
+
+    python benchmarks/startup.py [--runs N]
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOAD_SNIPPET = """
+import time
+start = time.perf_counter()
+from banking_system import config
+config["data"].load_all()
+print(time.perf_counter() - start)
+"""
+
+
+def time_cold_start(cache: bool, cache_dir: str) -> float:
+    python_path = os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")]))
+    env = dict(
+        os.environ,
+        BANKING_SYSTEM_CACHE_DIR=cache_dir,
+        BANKING_SYSTEM_SNAPSHOT_CACHE="1" if cache else "0",
+        PYTHONPATH=python_path,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", LOAD_SNIPPET],
+        env=env, cwd=REPO_ROOT, check=True, capture_output=True, text=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # First cached start writes the snapshots; it is reported separately
+        populate = time_cold_start(True, cache_dir)
+        results = {
+            "json": [time_cold_start(False, cache_dir) for _ in range(args.runs)],
+            "snapshot": [time_cold_start(True, cache_dir) for _ in range(args.runs)],
+        }
+
+    print(f"snapshot populate: {populate * 1000:8.1f} ms")
+    for label, times in results.items():
+        print(
+            f"{label:>17}: median {statistics.median(times) * 1000:8.1f} ms"
+            f"  min {min(times) * 1000:8.1f} ms  ({args.runs} runs)"
+        )
+    speedup = statistics.median(results["json"]) / statistics.median(results["snapshot"])
+    print(f"{'speedup':>17}: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import pytest
+
+from banking_system.amortization import loan_schedules
+from banking_system.data import load_json_files
+from banking_system.functions import FUNCTIONS_MAP
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_json_files(lazy=True)
+
+
+def test_loan_schedules_rows_are_not_shared_with_the_cache(data):
+    before = FUNCTIONS_MAP["get_loan_amortization_schedule"].apply(data, loan_id=1)
+    for row in loan_schedules(data, [1])[1]:
+        row["scheduled_amount"] = 0
+        row["note"] = "edited"
+    assert FUNCTIONS_MAP["get_loan_amortization_schedule"].apply(data, loan_id=1) == before
+    assert loan_schedules(data, [1])[1][0].get("note") is None
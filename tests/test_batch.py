@@ -0,0 +1,29 @@
+import re
+import glob
+import json
+import os
+
+import pytest
+
+from banking_system.batch import run_actions
+from banking_system.data import EpisodeData, load_json_files
+from banking_system.functions import FUNCTIONS_MAP
+
+TASKS = sorted(glob.glob(os.path.join(os.path.dirname(__file__), os.pardir, "tasks", "*.json")))
+# Timestamps from datetime.now() differ between the two runs
+_NOW = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+")
+
+
+@pytest.fixture(scope="module")
+def base():
+    return load_json_files(lazy=True)
+
+
+@pytest.mark.parametrize("path", TASKS, ids=os.path.basename)
+def test_run_actions_matches_sequential_dispatch(base, path):
+    with open(path, encoding="utf-8") as file:
+        actions = json.load(file)["actions"]
+    sequential = EpisodeData(base)
+    expected = [FUNCTIONS_MAP[a["name"]].apply(sequential, **a.get("arguments", {})) for a in actions]
+    result = run_actions(EpisodeData(base), actions)
+    assert [_NOW.sub("<now>", out) for out in result.outputs] == [_NOW.sub("<now>", out) for out in expected]
@@ -0,0 +1,48 @@
+from datetime import date, timedelta
+
+import pytest
+
+from banking_system.billing import generate_card_statements, generate_loan_statements
+from banking_system.data import EpisodeData, load_json_files
+from banking_system.functions import FUNCTIONS_MAP
+
+
+@pytest.fixture
+def data():
+    return EpisodeData(load_json_files(lazy=True))
+
+
+@pytest.mark.parametrize("card_id", [[1], {"a": 1}, "1", 1.0, None])
+def test_generate_card_statement_rejects_non_int_ids(data, card_id):
+    output = FUNCTIONS_MAP["generate_card_statement"].apply(data, card_id=card_id)
+    assert output == "Error: 'card_id' must be an integer"
+
+
+def test_generate_card_statements_returns_one_result_per_id(data):
+    results = generate_card_statements(data, [[1], "[1]", 1, 99999, 1])
+    assert [card_id for card_id, _ in results] == [[1], "[1]", 1, 99999, 1]
+    assert results[0][1] == results[1][1] == "Error: 'card_id' must be an integer"
+    assert results[3][1] == "Error: Card '99999' not found"
+    # A card listed twice is billed for two consecutive periods
+    first, second = results[2][1], results[4][1]
+    assert second["statement_id"] == first["statement_id"] + 1
+    assert date.fromisoformat(second["period_start"]) == date.fromisoformat(first["period_end"]) + timedelta(days=1)
+    assert [row for row in data["card_statements"].values() if row["card_id"] == 1][-2:] == [first, second]
+
+
+@pytest.mark.parametrize("loan_id", [[1], {"a": 1}, "1", 1.0, None])
+def test_generate_loan_statement_rejects_non_int_ids(data, loan_id):
+    output = FUNCTIONS_MAP["generate_loan_statement"].apply(data, loan_id=loan_id)
+    assert output == "Error: 'loan_id' must be an integer"
+
+
+def test_generate_loan_statements_returns_one_result_per_id(data):
+    results = generate_loan_statements(data, [{"a": 1}, "{'a': 1}", 1, 99999, 1])
+    assert [loan_id for loan_id, _ in results] == [{"a": 1}, "{'a': 1}", 1, 99999, 1]
+    assert results[0][1] == results[1][1] == "Error: 'loan_id' must be an integer"
+    assert results[3][1] == "Error: Loan '99999' not found"
+    # A loan listed twice gets two consecutive periods
+    first, second = results[2][1], results[4][1]
+    assert second["statement_id"] == first["statement_id"] + 1
+    assert date.fromisoformat(second["period_start"]) == date.fromisoformat(first["period_end"]) + timedelta(days=1)
+    assert [row for row in data["loan_statements"].values() if row["loan_id"] == 1][-2:] == [first, second]
@@ -0,0 +1,148 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from banking_system.data import (
+    EpisodeData, candidate_keys, find_row, insert_row, latest_keys, load_json_files, next_id,
+    payments_since, penalty_rate_keys, recent_keys, temporal_column, to_micros, update_row
+)
+from banking_system.data.indexes import parse_timestamp
+from banking_system.data.sequences import max_id
+
+TABLES = ("transactions", "customers", "cards", "loan_statements", "penalty_rates")
+OCCURRED_MIN = to_micros(datetime.min)
+
+
+@pytest.fixture(scope="module")
+def base():
+    return load_json_files(lazy=True)
+
+
+def snapshot(data):
+    return {table: {key: dict(row) for key, row in data[table].items()} for table in TABLES}
+
+
+def scan(table, field, value):
+    return [key for key, row in table.items() if row.get(field) == value]
+
+
+def newest_first(table, field, value, time_field):
+    # Stable descending sort: ties stay in table order
+    keys = scan(table, field, value)
+    return sorted(keys, key=lambda key: parse_timestamp(table[key].get(time_field)), reverse=True)
+
+
+def check_indexes(data, rnd):
+    """Every index helper against a scan of the current view."""
+    transactions, customers = data["transactions"], data["customers"]
+    for account_id in rnd.sample(range(1, 60), 8):
+        assert candidate_keys(data, "transactions", {"account_id": account_id}) == \
+            scan(transactions, "account_id", account_id)
+        assert recent_keys(data, "transactions", "account_id", account_id, "occurred_at", 3) == \
+            newest_first(transactions, "account_id", account_id, "occurred_at")[:3]
+
+    for customer in rnd.sample(list(customers.values()), 8):
+        email = customer["email"].lower()
+        assert candidate_keys(data, "customers", {}, folded={"email": email}) == \
+            [key for key, row in customers.items() if row.get("email", "").lower() == email]
+
+    merchants = sorted({row["merchant"] for row in transactions.values() if row.get("merchant")})
+    for merchant in rnd.sample(merchants, 5):
+        text = merchant[1:5].lower()
+        keys = candidate_keys(data, "transactions", {}, contains={"merchant": text})
+        assert [key for key in keys if text in (transactions[key].get("merchant") or "").lower()] == \
+            [key for key, row in transactions.items() if text in (row.get("merchant") or "").lower()]
+
+    cards = data["cards"]
+    for key, card in rnd.sample(list(cards.items()), 5):
+        assert find_row(data, "cards", "card_number", card["card_number"]) == \
+            next((k, row) for k, row in cards.items() if row.get("card_number") == card["card_number"])
+
+    statements = data["loan_statements"]
+    loan_ids = {row["loan_id"] for row in statements.values()}
+    latest = latest_keys(data, "loan_statements", "loan_id", loan_ids, "period_end")
+    assert latest == {loan_id: newest_first(statements, "loan_id", loan_id, "period_end")[0] for loan_id in loan_ids}
+
+    start = to_micros(datetime(2025, 6, 1))
+    for beneficiary_id in rnd.sample(range(1, 200), 8):
+        total = 0.0
+        for key, row in transactions.items():
+            occurred = temporal_column(data, "transactions", "occurred_at").get(key)
+            if row.get("type") == "PAYMENT" and row.get("beneficiary_id") == beneficiary_id and \
+                    (OCCURRED_MIN if occurred is None else occurred) >= start:
+                total += float(row.get("amount", 0))
+        assert payments_since(data, beneficiary_id, start) == total
+
+    for key, row in rnd.sample(list(transactions.items()), 20):
+        assert temporal_column(data, "transactions", "occurred_at").get(key) == to_micros(row.get("occurred_at"))
+
+    rates = data["penalty_rates"]
+    for days in (0, 1, 30, 31, 45, 61, 400):
+        assert penalty_rate_keys(data, "LOAN", None, days) == [
+            key for key, rate in rates.items() if rate.get("product_type") == "LOAN"
+            and days >= rate.get("days_overdue_from", 0)
+            and (rate.get("days_overdue_to") is None or days <= rate.get("days_overdue_to"))
+        ]
+
+    for table in TABLES:
+        assert next_id(data, table) == max_id(data[table]) + 1
+
+
+def random_writes(data, rnd, count):
+    transactions = data["transactions"]
+    for _ in range(count):
+        op = rnd.randrange(6)
+        if op == 0:
+            key = str(next_id(data, "transactions"))
+            row = dict(rnd.choice(list(transactions.values())), transaction_id=int(key))
+            row.update(account_id=rnd.randint(1, 60), type=rnd.choice(["PAYMENT", "DEPOSIT"]),
+                       beneficiary_id=rnd.randint(1, 200), merchant=rnd.choice([None, "Acme Widgets"]))
+            insert_row(data, "transactions", key, row)
+        elif op == 1:
+            key = rnd.choice(list(transactions))
+            update_row(data, "transactions", key, {
+                "account_id": rnd.randint(1, 60),
+                "occurred_at": f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T10:00:00",
+                "amount": rnd.choice([5, 12.5, 300]),
+            })
+        elif op == 2:
+            key = rnd.choice(list(data["customers"]))
+            email = data["customers"][key]["email"]
+            update_row(data, "customers", key, {"email": rnd.choice([email.upper(), "shared@example.com"])})
+        elif op == 3:
+            key = rnd.choice(list(data["cards"]))
+            update_row(data, "cards", key, {"card_number": rnd.choice(list(data["cards"].values()))["card_number"]})
+        elif op == 4:
+            key = rnd.choice(list(data["loan_statements"]))
+            update_row(data, "loan_statements", key, {"period_end": f"2026-0{rnd.randint(1, 9)}-28",
+                                                      "status": "PAID"})
+        else:
+            key = rnd.choice(list(data["penalty_rates"]))
+            update_row(data, "penalty_rates", key, {"days_overdue_from": rnd.randint(0, 70)})
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_rollback_restores_rows_and_indexes(base, seed):
+    rnd = random.Random(seed)
+    baseline = snapshot(base)
+    data = EpisodeData(base)
+    # Build every index first so the writes and rollbacks must maintain them
+    check_indexes(data, rnd)
+
+    random_writes(data, rnd, 60)
+    check_indexes(data, rnd)
+    savepoint = data.savepoint()
+    at_savepoint = snapshot(data)
+
+    random_writes(data, rnd, 60)
+    check_indexes(data, rnd)
+
+    data.rollback(savepoint)
+    assert snapshot(data) == at_savepoint
+    check_indexes(data, rnd)
+
+    data.reset()
+    assert snapshot(data) == baseline
+    assert snapshot(base) == baseline
+    check_indexes(data, rnd)
@@ -0,0 +1,108 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from banking_system.data import (
+    CONTAINS, EQ, NUMERIC, RANGE, TIME_RANGE, EpisodeData, filter_rows, insert_row, load_json_files, next_id,
+    to_micros, update_row
+)
+
+pytest.importorskip("numpy")
+
+OCCURRED_MIN = to_micros(datetime.min)
+
+
+def holds(predicate, row):
+    """Reference semantics of one predicate, as documented in filters.py."""
+    op, field = predicate[0], predicate[1]
+    value = row.get(field)
+    if op == EQ:
+        return value == predicate[2]
+    if op in (NUMERIC, RANGE):
+        # Callers pair RANGE with NUMERIC, so non-numeric values fail both
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return False
+        low, high = predicate[2:4] if op == RANGE else (None, None)
+        return (low is None or value >= low) and (high is None or value <= high)
+    if op == TIME_RANGE:
+        low, high, missing = predicate[2], predicate[3], predicate[4]
+        micros = to_micros(value)
+        micros = missing if micros is None else micros
+        return (low is None or micros >= low) and (high is None or micros <= high)
+    if op == CONTAINS:
+        return predicate[2] in (value or '').lower()
+    raise AssertionError(op)
+
+
+def random_time(rnd):
+    return f"2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}T{rnd.randint(0, 23):02d}:00:00"
+
+
+def random_writes(datas, rnd, count):
+    """The same random inserts and updates, applied to each of datas."""
+    transactions = datas[0]["transactions"]
+    for _ in range(count):
+        if rnd.random() < 0.4:
+            key = str(next_id(datas[0], "transactions"))
+            row = dict(rnd.choice(list(transactions.values())), transaction_id=int(key))
+            row.update(account_id=rnd.randint(1, 60), merchant=rnd.choice([None, "Acme Widgets", "Zeta Foods"]))
+            for data in datas:
+                insert_row(data, "transactions", key, dict(row))
+        else:
+            key = rnd.choice(list(transactions))
+            changes = rnd.choice([
+                {"account_id": rnd.randint(1, 60)},
+                {"type": rnd.choice(["PAYMENT", "DEPOSIT", "CARD_PURCHASE"])},
+                {"amount": rnd.choice([5, 12.5, 300.0, None, "n/a"])},
+                {"occurred_at": rnd.choice([random_time(rnd), None, "not a date"])},
+                {"merchant": rnd.choice([None, "ACME widgets", "Zeta Foods", ""])},
+                {"card_id": rnd.choice([None, rnd.randint(1, 40)])},
+            ])
+            for data in datas:
+                update_row(data, "transactions", key, dict(changes))
+
+
+def random_predicates(rnd):
+    choices = [
+        lambda: (EQ, "account_id", rnd.randint(1, 60)),
+        lambda: (EQ, "account_id", str(rnd.randint(1, 60))),
+        lambda: (EQ, "type", rnd.choice(["PAYMENT", "DEPOSIT", "CARD_PURCHASE", "REFUND"])),
+        lambda: (EQ, "card_id", rnd.choice([None, rnd.randint(1, 40)])),
+        lambda: (NUMERIC, "amount"),
+        lambda: (RANGE, "amount", rnd.choice([None, 10, 100.5]), rnd.choice([None, 200, 1000.0])),
+        lambda: (TIME_RANGE, "occurred_at", to_micros(random_time(rnd)), rnd.choice([None, to_micros("2025-10-01")]),
+                 OCCURRED_MIN),
+        lambda: (CONTAINS, "merchant", rnd.choice(["acme", "zeta", "o", "nothing"])),
+    ]
+    return [rnd.choice(choices)() for _ in range(rnd.randint(1, 3))]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_columnar_filter_matches_scan_after_overlay_writes(seed):
+    rnd = random.Random(seed)
+    plain_base = load_json_files(lazy=True)
+    columnar_base = load_json_files(lazy=True, columnar=True)
+    # Writes to the LazyTables overlay, then to an episode overlay above it
+    random_writes([plain_base, columnar_base], rnd, 80)
+    plain, columnar = EpisodeData(plain_base), EpisodeData(columnar_base)
+    random_writes([plain, columnar], rnd, 80)
+    savepoint = columnar.savepoint()
+    random_writes([plain, columnar], rnd, 40)
+    plain.rollback(savepoint)
+    columnar.rollback(savepoint)
+    assert filter_rows(plain["transactions"], [(EQ, "type", "PAYMENT")], lambda key, row: True) is None
+
+    rows = list(plain["transactions"].items())
+    for _ in range(60):
+        predicates = random_predicates(rnd)
+
+        def matches(key, row):
+            return all(holds(predicate, row) for predicate in predicates)
+
+        expected = [row for key, row in rows if matches(key, row)]
+        stop = rnd.choice([None, 1, 10, len(expected) + 1])
+        # Every predicate here maps onto the arrays, so the columnar path must answer
+        assert filter_rows(columnar["transactions"], predicates, matches, stop=stop) == expected[:stop]
@@ -0,0 +1,36 @@
+import pytest
+
+from banking_system.data import candidate_keys, find_row, insert_row, load_json_files, next_id, update_row
+
+
+def scan(table, field, value):
+    return [key for key, row in table.items() if row.get(field) == value]
+
+
+@pytest.fixture
+def data():
+    return load_json_files(lazy=True)
+
+
+def test_lazy_tables_indexes_follow_writes(data):
+    transactions = data["transactions"]
+    assert candidate_keys(data, "transactions", {"account_id": 1}) == scan(transactions, "account_id", 1)
+
+    key = str(next_id(data, "transactions"))
+    insert_row(data, "transactions", key, dict(transactions["1"], transaction_id=int(key), account_id=1))
+    moved = scan(transactions, "account_id", 2)[0]
+    update_row(data, "transactions", moved, {"account_id": 1})
+    left = scan(transactions, "account_id", 1)[0]
+    update_row(data, "transactions", left, {"account_id": 3})
+
+    for account_id in (1, 2, 3):
+        assert candidate_keys(data, "transactions", {"account_id": account_id}) == \
+            scan(transactions, "account_id", account_id)
+
+
+def test_lazy_tables_replaced_table_drops_its_indexes(data):
+    card = next(iter(data["cards"].values()))
+    assert find_row(data, "cards", "card_number", card["card_number"])[1] is card
+    data["cards"] = {"1": dict(card, card_number="0000")}
+    assert find_row(data, "cards", "card_number", card["card_number"]) is None
+    assert find_row(data, "cards", "card_number", "0000") == ("1", data["cards"]["1"])
@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from banking_system.data import EQ, ColumnarRows, columnar_store, filter_rows, insert_row, load_json_files, next_id
+from banking_system.functions import FUNCTIONS_MAP
+from banking_system.pagination import Page
+
+list_transactions = FUNCTIONS_MAP["list_account_transactions"].apply
+
+
+@pytest.fixture(scope="module", params=["lazy", "columnar"])
+def data(request):
+    if request.param == "columnar":
+        pytest.importorskip("numpy")
+    return load_json_files(lazy=True, columnar=request.param == "columnar")
+
+
+def pages(data, **kwargs):
+    """Every page of a paged call, following next_cursor to the end."""
+    found, cursor = [], None
+    while True:
+        page = json.loads(list_transactions(data, cursor=cursor, **kwargs))
+        found.append(page["results"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return found
+        # The cursor carries the offset; a following call only passes it (and limit)
+        kwargs.pop("offset", None)
+
+
+@pytest.mark.parametrize("order_by", [None, "amount", "-amount", "-occurred_at"])
+def test_cursor_pages_add_up_to_the_full_list(data, order_by):
+    full = json.loads(list_transactions(data, type="CARD_PURCHASE", order_by=order_by))
+    paged = pages(data, type="CARD_PURCHASE", order_by=order_by, limit=700)
+    assert all(len(page) == 700 for page in paged[:-1])
+    assert [row for page in paged for row in page] == full
+
+    paged = pages(data, type="CARD_PURCHASE", order_by=order_by, limit=700, offset=50)
+    assert [row for page in paged for row in page] == full[50:]
+
+
+def test_rows_missing_the_field_come_last():
+    rows = [{"id": 1, "v": 3}, {"id": 2}, {"id": 3, "v": None}, {"id": 4, "v": 1}, {"id": 5, "v": 2}]
+    for limit in (None, 2, 4):
+        ascending = Page.parse(limit=limit, order_by="v").apply(rows)
+        descending = Page.parse(limit=limit, order_by="-v").apply(rows)
+        if limit is not None:
+            ascending, descending = ascending["results"], descending["results"]
+        assert [row["id"] for row in ascending] == [4, 5, 1, 2, 3][:limit]
+        assert [row["id"] for row in descending] == [1, 5, 4, 2, 3][:limit]
+
+
+def test_unorderable_values_are_an_error():
+    rows = [{"v": 1}, {"v": "a"}]
+    assert Page.parse(order_by="v").apply(rows) == "Error: Cannot order by 'v': values are not comparable"
+
+
+def test_cursor_for_another_order_by_is_rejected(data):
+    cursor = json.loads(list_transactions(data, type="CARD_PURCHASE", order_by="amount", limit=10))["next_cursor"]
+    assert list_transactions(data, cursor=cursor, order_by="-amount", limit=10) == \
+        "Error: 'cursor' was issued for a different 'order_by'"
+    # Without order_by the cursor's own ordering is used
+    again = json.loads(list_transactions(data, type="CARD_PURCHASE", cursor=cursor, limit=10))
+    assert again == json.loads(list_transactions(data, type="CARD_PURCHASE", order_by="amount", offset=10, limit=10))
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm90IGpzb24=", "W10=", "eyJvZmZzZXQiOiAtMX0=", 12])
+def test_invalid_cursor_is_rejected(data, cursor):
+    assert list_transactions(data, cursor=cursor, limit=10) == "Error: 'cursor' is invalid"
+
+
+@pytest.mark.parametrize("kwargs, error", [
+    ({"limit": 0}, "Error: 'limit' must be a positive integer"),
+    ({"limit": "x"}, "Error: 'limit' must be a positive integer"),
+    ({"offset": -1}, "Error: 'offset' must be a non-negative integer"),
+    ({"order_by": "-"}, "Error: 'order_by' must be a field name, optionally prefixed with '-'"),
+])
+def test_invalid_arguments_are_rejected(kwargs, error):
+    assert Page.parse(**kwargs) == error
+
+
+def test_columnar_page_materializes_only_the_rows_it_needs(monkeypatch):
+    pytest.importorskip("numpy")
+    data = load_json_files(lazy=True, columnar=True)
+    transactions = data["transactions"]
+    assert columnar_store(transactions) is not None
+    full = list(filter_rows(transactions, [(EQ, "type", "CARD_PURCHASE")], lambda key, row: True))
+
+    built = []
+    rows_at = ColumnarRows.rows_at
+
+    def counting_rows_at(self, positions):
+        built.append(len(positions))
+        return rows_at(self, positions)
+
+    monkeypatch.setattr(ColumnarRows, "rows_at", counting_rows_at)
+    page = Page.parse(limit=20, offset=5)
+    assert page.stop == 26
+    assert filter_rows(transactions, [(EQ, "type", "CARD_PURCHASE")], lambda key, row: True, stop=page.stop) == \
+        full[:26]
+    assert built == [26]
+
+    # Rows inserted into the view are appended after the store's, and also stop at stop
+    key = str(next_id(data, "transactions"))
+    insert_row(data, "transactions", key, dict(full[0], transaction_id=int(key)))
+    matches = lambda key, row: row.get("type") == "CARD_PURCHASE"
+    everything = filter_rows(transactions, [(EQ, "type", "CARD_PURCHASE")], matches)
+    assert everything[-1]["transaction_id"] == int(key)
+    assert filter_rows(transactions, [(EQ, "type", "CARD_PURCHASE")], matches, stop=len(full)) == full
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from banking_system.data import load_json_files
+from banking_system.functions import FUNCTIONS_MAP
+from banking_system.projection import Projection, compile_projector
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_json_files(lazy=True)
+
+
+def test_fields_accepts_columns_missing_from_the_schema(data):
+    output = FUNCTIONS_MAP["list_customer_cards"].apply(data, account_id=1, fields=["card_id", "account_id"])
+    rows = json.loads(output)
+    assert rows and all(list(row) == ["card_id", "account_id"] and row["account_id"] == 1 for row in rows)
+
+
+def test_fields_rejects_hidden_columns(data):
+    output = FUNCTIONS_MAP["list_customers"].apply(data, customer_id=1, fields=["customer_id", "created_at"])
+    assert output == "Error: Unknown field(s) for customers: created_at"
+
+
+def test_fields_rejects_names_that_are_not_columns(data):
+    output = FUNCTIONS_MAP["list_customers"].apply(data, fields=["emial"], limit=2)
+    assert output == "Error: Unknown field(s) for customers: emial"
+    output = FUNCTIONS_MAP["list_account_transactions"].apply(data, account_id=1, fields=["billing_cycle", "x"])
+    assert output == "Error: Unknown field(s) for transactions: x"
+
+
+def test_rejected_fields_do_not_grow_the_projector_cache(data):
+    compile_projector.cache_clear()
+    for number in range(2000):
+        assert isinstance(Projection.parse("customers", [f"x{number}"], data["customers"]), str)
+    assert compile_projector.cache_info().currsize == 0
+    # Valid field lists still vary with the caller, so the cache is bounded
+    assert compile_projector.cache_info().maxsize is not None
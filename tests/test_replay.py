@@ -0,0 +1,11 @@
+import os
+
+from banking_system.replay import load_task_cases, replay
+
+TASK1 = os.path.join(os.path.dirname(__file__), os.pardir, "tasks", "task1.json")
+
+
+def test_replay_does_not_coerce_recorded_arguments():
+    # Step 3 passes bank_id="4"; real dispatch matches no branch
+    [result] = replay(load_task_cases([TASK1]), workers=1)
+    assert any(failure.startswith("step 3 (list_branches): $: 0 items") for failure in result.failures)
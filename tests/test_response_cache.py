@@ -0,0 +1,55 @@
+import inspect
+
+import pytest
+
+from banking_system.data import load_json_files
+from banking_system.functions import FUNCTIONS_MAP
+from banking_system.response_cache import READ_TABLES, ResponseCache
+
+# Real keyword arguments of every cached function, as the tasks call them
+CALLS = {
+    "get_account_summary": {"account_id": 1, "recent_txns_count": 3},
+    "get_bank_by_name": {"name": "First National"},
+    "get_loan_amortization_schedule": {"loan_id": 1},
+    "list_account_transactions": {"account_id": 1, "limit": 5},
+    "list_beneficiaries": {"customer_id": 1, "name": "Own"},
+    "list_branches": {"bank_id": 1, "name": "Brianfort"},
+    "list_card_statements": {"card_id": 1},
+    "list_card_transactions": {"card_id": 1, "limit": 5},
+    "list_customer_accounts": {"customer_id": 1},
+    "list_customer_cards": {"account_id": 1},
+    "list_customer_loans": {"customer_id": 1},
+    "list_customers": {"first_name": "a", "status": "ACTIVE", "limit": 3},
+    "list_employees": {"branch_id": 1},
+    "list_loan_statements": {"loan_id": 1},
+    "list_penalty_rates": {"product_type": "LOAN", "overdue_days": 45},
+}
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_json_files(lazy=True)
+
+
+def test_every_cached_function_has_a_call():
+    assert set(CALLS) == set(READ_TABLES)
+
+
+@pytest.mark.parametrize("name", sorted(READ_TABLES))
+def test_cached_call_matches_direct_call(data, name):
+    cache = ResponseCache(FUNCTIONS_MAP)
+    functions = cache.wrap()
+    expected = FUNCTIONS_MAP[name].apply(data, **CALLS[name])
+    assert functions[name].apply(data, **CALLS[name]) == expected
+    assert functions[name].apply(data, **CALLS[name]) == expected
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("name", sorted(READ_TABLES))
+def test_every_parameter_passes_through_as_keyword(data, name):
+    # Parameters such as `name` must not collide with the wrapper's own
+    parameters = list(inspect.signature(FUNCTIONS_MAP[name].apply).parameters.values())[1:]
+    kwargs = {p.name: p.default for p in parameters if p.default is not inspect.Parameter.empty}
+    kwargs.update(CALLS[name])
+    functions = ResponseCache(FUNCTIONS_MAP).wrap()
+    assert functions[name].apply(data, **kwargs) == FUNCTIONS_MAP[name].apply(data, **kwargs)
@@ -0,0 +1,135 @@
+import json
+import os
+import pickle
+
+import pytest
+
+from banking_system.data.snapshot import fingerprint, load_table_cached, read_snapshot, snapshot_path, write_snapshot
+
+TABLE = {"1": {"bank_id": 1, "name": "First"}, "7": {"bank_id": 7, "name": "Second"}}
+# A snapshot payload the JSON file cannot produce: returning it proves the snapshot was used
+POISONED = {"table": {"99": {"bank_id": 99}}, "last_id": 99}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "banks.json"
+    path.write_text(json.dumps(TABLE))
+    return path
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def poison(source, cache_dir):
+    """Write POISONED under the header of source's current contents."""
+    raw = source.read_bytes()
+    assert write_snapshot(snapshot_path(cache_dir, "banks"), fingerprint(raw, str(source)), POISONED)
+
+
+def test_first_load_parses_and_writes_the_snapshot(source, cache_dir):
+    assert load_table_cached(str(source), "banks", cache_dir) == (TABLE, 7)
+    key = fingerprint(source.read_bytes(), str(source))
+    assert read_snapshot(snapshot_path(cache_dir, "banks"), key) == {"table": TABLE, "last_id": 7}
+
+
+def test_matching_snapshot_is_used(source, cache_dir):
+    poison(source, cache_dir)
+    assert load_table_cached(str(source), "banks", cache_dir) == (POISONED["table"], 99)
+
+
+def test_changed_mtime_reparses(source, cache_dir):
+    poison(source, cache_dir)
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_table_cached(str(source), "banks", cache_dir) == (TABLE, 7)
+
+
+def test_changed_size_reparses(source, cache_dir):
+    poison(source, cache_dir)
+    stat = os.stat(source)
+    changed = dict(TABLE, **{"12": {"bank_id": 12, "name": "Third"}})
+    source.write_text(json.dumps(changed))
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_table_cached(str(source), "banks", cache_dir) == (changed, 12)
+
+
+def test_changed_content_of_same_size_and_mtime_reparses(source, cache_dir):
+    poison(source, cache_dir)
+    stat = os.stat(source)
+    raw = source.read_bytes()
+    changed = raw.replace(b"First", b"Fir5t")
+    assert len(changed) == len(raw)
+    source.write_bytes(changed)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    table, _ = load_table_cached(str(source), "banks", cache_dir)
+    assert table["1"]["name"] == "Fir5t"
+
+
+@pytest.mark.parametrize("contents", [b"", b"garbage", b"\x80\x05\x95"])
+def test_corrupt_snapshot_falls_back_to_json(source, cache_dir, contents):
+    path = snapshot_path(cache_dir, "banks")
+    os.makedirs(cache_dir)
+    with open(path, "wb") as file:
+        file.write(contents)
+    assert load_table_cached(str(source), "banks", cache_dir) == (TABLE, 7)
+    # ...and the snapshot is rewritten whole
+    with open(path, "rb") as file:
+        assert pickle.load(file) == fingerprint(source.read_bytes(), str(source))
+        assert pickle.load(file) == {"table": TABLE, "last_id": 7}
+
+
+def test_truncated_snapshot_falls_back_to_json(source, cache_dir):
+    load_table_cached(str(source), "banks", cache_dir)
+    path = snapshot_path(cache_dir, "banks")
+    with open(path, "rb") as file:
+        raw = file.read()
+    with open(path, "wb") as file:
+        file.write(raw[:len(raw) - 10])
+    assert load_table_cached(str(source), "banks", cache_dir) == (TABLE, 7)
+
+
+def test_rewrite_replaces_the_snapshot_atomically(source, cache_dir, monkeypatch):
+    poison(source, cache_dir)
+    path = snapshot_path(cache_dir, "banks")
+    replaced = []
+    replace = os.replace
+
+    def recording_replace(src, dst):
+        # The new snapshot is complete before it takes the old one's place
+        with open(src, "rb") as file:
+            assert pickle.load(file)["sha256"]
+            assert pickle.load(file) == {"table": TABLE, "last_id": 7}
+        replaced.append((src, dst))
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", recording_replace)
+    source.write_text(json.dumps(TABLE, indent=1))
+    assert load_table_cached(str(source), "banks", cache_dir) == (TABLE, 7)
+    assert [dst for _, dst in replaced] == [path]
+    assert os.listdir(cache_dir) == [os.path.basename(path)]
+
+
+def test_failed_rewrite_keeps_the_old_snapshot(source, cache_dir, monkeypatch):
+    poison(source, cache_dir)
+    path = snapshot_path(cache_dir, "banks")
+    with open(path, "rb") as file:
+        before = file.read()
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    source.write_text(json.dumps(TABLE, indent=1))
+    assert load_table_cached(str(source), "banks", cache_dir) == (TABLE, 7)
+    with open(path, "rb") as file:
+        assert file.read() == before
+    assert os.listdir(cache_dir) == [os.path.basename(path)]
+
+
+def test_unwritable_cache_dir_only_disables_the_cache(source, tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    assert load_table_cached(str(source), "banks", str(blocker)) == (TABLE, 7)